@@ -769,6 +769,9 @@ class AutonomousOrchestrationSystem:
             if task.task_state == AutonomousTaskState.EXECUTING:
                 await self._create_autonomous_checkpoint(task)
         
+        # Persist queued session writes and stop the Mem0 I/O threads
+        await self.session_manager.close()
+        
         logger.info("✅ Autonomous Orchestration System shutdown complete")
 
 # Integration function
@@ -8,7 +8,7 @@ import asyncio
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 import logging
 from collections import defaultdict, deque
@@ -608,10 +608,22 @@ class EnhancedMemoryManager:
     def _memory_to_dict(self, memory: MemoryRecord) -> Dict[str, Any]:
         """Convert memory record to dictionary"""
         
-        result = asdict(memory)
-        result['created_at'] = memory.created_at.isoformat() if memory.created_at else None
-        result['accessed_at'] = memory.accessed_at.isoformat() if memory.accessed_at else None
-        return result
+        # Built by hand: asdict() would deep-copy every nested container,
+        # including the embedding, on each recall
+        return {
+            'id': memory.id,
+            'type': memory.type,
+            'content': dict(memory.content),
+            'user_id': memory.user_id,
+            'agent_id': memory.agent_id,
+            'importance': memory.importance,
+            'tags': list(memory.tags),
+            'created_at': memory.created_at.isoformat() if memory.created_at else None,
+            'accessed_at': memory.accessed_at.isoformat() if memory.accessed_at else None,
+            'access_count': memory.access_count,
+            'related_memories': list(memory.related_memories),
+            'embedding': memory.embedding
+        }
     
     async def _get_recent_memories(self, user_id: str, hours: int = 24, days: Optional[int] = None, limit: int = 20) -> List[Dict[str, Any]]:
         """Get recent memories for a user"""
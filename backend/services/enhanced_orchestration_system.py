@@ -6,16 +6,35 @@ Advanced orchestration with specialized agents, intelligent planning, and collab
 
 import asyncio
 import json
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from enum import Enum
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from abc import ABC, abstractmethod
 import logging
 from collections import defaultdict, deque
 
 logger = logging.getLogger(__name__)
 
+# Tools each agent type can use, keyed by the agent id prefix ('scout_agent_1' -> 'scout').
+# The lists are shared by every agent context and must be treated as read-only.
+_AGENT_TOOLS = {
+    'scout': ['scrapybara', 'web_search', 'document_analysis', 'github_api'],
+    'mama_bear': ['code_generation', 'planning', 'review', 'coordination'],
+    'model_manager': ['model_selection', 'fine_tuning', 'deployment', 'monitoring'],
+    'monitor': ['resource_tracking', 'alerting', 'quota_management', 'billing'],
+    'planner': ['task_decomposition', 'dependency_analysis', 'estimation', 'optimization'],
+    'research': ['web_scraping', 'document_analysis', 'data_synthesis', 'trend_analysis'],
+    'devops': ['deployment', 'monitoring', 'infrastructure', 'CI/CD'],
+    'integration': ['api_design', 'system_integration', 'data_flow', 'service_mesh'],
+    'live_api': ['real_time_data', 'webhooks', 'streaming', 'event_processing']
+}
+_NO_TOOLS: List[str] = []
+
+# Daily request limit assumed for each model when estimating remaining API quota
+_DEFAULT_DAILY_LIMIT = 1500
+
 class AgentState(Enum):
     IDLE = "idle"
     THINKING = "thinking"
@@ -61,6 +80,19 @@ class AgentContext:
         if self.collaboration_state is None:
             self.collaboration_state = {}
 
+@dataclass(slots=True)
+class AgentPerformance:
+    """Running performance counters for a single agent"""
+    requests: int = 0
+    successful: int = 0
+    success_rate: float = 0.8
+    avg_response_time: float = 2.0
+    last_update: float = field(default_factory=lambda: datetime.now().timestamp())
+    last_activity: str = 'never'
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
 @dataclass
 class Task:
     """Represents a task that can be executed by agents"""
@@ -121,12 +153,18 @@ class AgentCapability(ABC):
 class ContextAwareness:
     """Manages what agents know about the current situation"""
     
+    # Resource limits are reused for this long (seconds) while the model status is unchanged
+    RESOURCE_LIMITS_TTL = 0.5
+    
     def __init__(self, memory_manager, model_manager):
         self.memory = memory_manager
         self.model_manager = model_manager
         self.global_context = {}
         self.agent_contexts = {}
         
+        # agent_id -> (monotonic time, model status version, limits)
+        self._limits_cache: Dict[str, Tuple[float, Any, Dict[str, Any]]] = {}
+        
     async def update_global_context(self, key: str, value: Any):
         """Update global context that all agents can access"""
         self.global_context[key] = {
@@ -150,45 +188,63 @@ class ContextAwareness:
         context.user_intent = self.global_context.get('user_intent', {}).get('value', '')
         context.project_context = self.global_context.get('project_state', {}).get('value', {})
         
-        # Get recent conversation history from memory
-        context.conversation_history = await self.memory.get_recent_conversations(
-            agent_id=agent_id, 
-            limit=10
+        # Available tools are a table lookup
+        context.available_tools = self._get_available_tools(agent_id)
+        
+        # Fetch conversation history and resource limits concurrently
+        history, limits = await asyncio.gather(
+            self.memory.get_recent_conversations(agent_id=agent_id, limit=10),
+            self._get_resource_limits(agent_id),
+            return_exceptions=True
         )
         
-        # Get available tools and resources
-        context.available_tools = await self._get_available_tools(agent_id)
-        context.resource_limits = await self._get_resource_limits(agent_id)
+        # A failed lookup keeps the agent's previous value instead of failing the turn;
+        # cancellation comes back as a BaseException and must still propagate
+        for outcome in (history, limits):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+        if isinstance(history, BaseException):
+            logger.warning(f"Could not load conversation history for {agent_id}: {history}")
+        else:
+            context.conversation_history = history
+        if isinstance(limits, BaseException):
+            logger.warning(f"Could not load resource limits for {agent_id}: {limits}")
+        else:
+            context.resource_limits = limits
         
         return context
     
-    async def _get_available_tools(self, agent_id: str) -> List[str]:
-        """Get tools available to this agent"""
-        agent_type = agent_id.split('_')[0]  # e.g., 'scout_agent_1' -> 'scout'
-        
-        tool_mapping = {
-            'scout': ['scrapybara', 'web_search', 'document_analysis', 'github_api'],
-            'mama_bear': ['code_generation', 'planning', 'review', 'coordination'],
-            'model_manager': ['model_selection', 'fine_tuning', 'deployment', 'monitoring'],
-            'monitor': ['resource_tracking', 'alerting', 'quota_management', 'billing'],
-            'planner': ['task_decomposition', 'dependency_analysis', 'estimation', 'optimization'],
-            'research': ['web_scraping', 'document_analysis', 'data_synthesis', 'trend_analysis'],
-            'devops': ['deployment', 'monitoring', 'infrastructure', 'CI/CD'],
-            'integration': ['api_design', 'system_integration', 'data_flow', 'service_mesh'],
-            'live_api': ['real_time_data', 'webhooks', 'streaming', 'event_processing']
-        }
-        
-        return tool_mapping.get(agent_type, [])
+    def _get_available_tools(self, agent_id: str) -> List[str]:
+        """Get tools available to this agent (a shared list, not to be modified)"""
+        return _AGENT_TOOLS.get(agent_id.partition('_')[0], _NO_TOOLS)
     
     async def _get_resource_limits(self, agent_id: str) -> Dict[str, Any]:
-        """Get resource limits for this agent"""
+        """Get resource limits for this agent (a shared dict, not to be modified)"""
+        # Model managers without a status version fall back to the TTL alone
+        get_version = getattr(self.model_manager, 'get_model_status_version', None)
+        version = get_version() if get_version is not None else None
+        
+        now = time.monotonic()
+        cached = self._limits_cache.get(agent_id)
+        if cached is not None and cached[1] == version and now - cached[0] < self.RESOURCE_LIMITS_TTL:
+            return cached[2]
+        
+        limits = self._compute_resource_limits()
+        self._limits_cache[agent_id] = (now, version, limits)
+        return limits
+    
+    def _compute_resource_limits(self) -> Dict[str, Any]:
+        """Build resource limits from the model manager's current quota status"""
         # Check current quota status from model manager
         model_status = self.model_manager.get_model_status()
         
+        # get_model_status() maps model id -> status dict; remaining quota is
+        # what is left of each model's daily request allowance
         return {
             'api_quota_remaining': sum(
-                model['quota_limit'] - model['quota_used'] 
-                for model in model_status['models']
+                max(0, _DEFAULT_DAILY_LIMIT - int(model.get('requests_today') or 0))
+                for model in model_status.values()
+                if isinstance(model, dict)
             ),
             'scrapybara_instances': 5,  # Max concurrent instances
             'memory_limit_mb': 1024,
@@ -219,11 +275,7 @@ class EnhancedAgentOrchestrator:
         self.collaboration_sessions = {}
         
         # Performance tracking
-        self.agent_performance = defaultdict(lambda: {
-            'success_rate': 0.8, 
-            'avg_response_time': 2.0,
-            'last_update': datetime.now().timestamp()
-        })
+        self.agent_performance: Dict[str, AgentPerformance] = defaultdict(AgentPerformance)
         
         # Initialize specialized agents
         self._initialize_agents()
@@ -316,7 +368,10 @@ class EnhancedAgentOrchestrator:
                         'page_context': page_context,
                         'user_patterns': user_patterns,
                         'available_agents': list(self.agents.keys()),
-                        'agent_performance': dict(self.agent_performance)
+                        'agent_performance': {
+                            agent_id: performance.to_dict()
+                            for agent_id, performance in self.agent_performance.items()
+                        }
                     }
                 )
             except AttributeError:
@@ -673,10 +728,10 @@ class EnhancedAgentOrchestrator:
         
         # Update success rate with exponential moving average
         alpha = 0.1
-        current['success_rate'] = (1 - alpha) * current['success_rate'] + alpha * (1.0 if success else 0.0)
+        current.success_rate = (1 - alpha) * current.success_rate + alpha * (1.0 if success else 0.0)
         
         # Update timestamp
-        current['last_update'] = datetime.now().timestamp()
+        current.last_update = datetime.now().timestamp()
     
     async def _fallback_response(self, message: str, user_id: str) -> Dict[str, Any]:
         """Fallback response when routing fails"""
@@ -721,7 +776,7 @@ class EnhancedAgentOrchestrator:
                 'current_task': agent.current_task,
                 'last_activity': agent.last_activity,
                 'message_queue_size': len(self.agent_messages[agent_id]),
-                'performance': self.agent_performance.get(agent_id, {})
+                'performance': self.agent_performance[agent_id].to_dict() if agent_id in self.agent_performance else {}
             }
         
         return {
@@ -761,18 +816,18 @@ class EnhancedAgentOrchestrator:
         total_response_time = 0.0
         
         for agent_id, performance in self.agent_performance.items():
-            agent_metrics = {
-                'requests_handled': performance.get('requests', 0),
-                'success_rate': performance.get('success_rate', 0.0),
-                'average_response_time': performance.get('avg_response_time', 0.0),
-                'last_activity': performance.get('last_activity', 'never')
+            requests = performance.requests
+            response_time = performance.avg_response_time
+            
+            metrics['agent_performance'][agent_id] = {
+                'requests_handled': requests,
+                'success_rate': performance.success_rate,
+                'average_response_time': response_time,
+                'last_activity': performance.last_activity
             }
-            metrics['agent_performance'][agent_id] = agent_metrics
             
             # Aggregate for system metrics
-            requests = performance.get('requests', 0)
-            successful = performance.get('successful', 0)
-            response_time = performance.get('avg_response_time', 0.0)
+            successful = performance.successful
             
             total_requests += requests
             total_successful += successful
@@ -865,12 +920,12 @@ class EnhancedAgentOrchestrator:
                 
                 # Example: Suggest memory cleanup
                 if hasattr(self.memory, 'memory_cache') and len(self.memory.memory_cache) > 100:
-                    logger.info("📝 Proactive suggestion: Memory consolidation recommended")
+                    logger.debug("📝 Proactive suggestion: Memory consolidation recommended")
                 
                 # Example: Suggest performance optimization
                 active_sessions = len(self.collaboration_sessions)
                 if active_sessions > 5:
-                    logger.info("⚡ Proactive suggestion: Performance optimization available")
+                    logger.debug("⚡ Proactive suggestion: Performance optimization available")
                 
             except Exception as e:
                 logger.error(f"Proactive scheduler error: {e}")
@@ -888,7 +943,7 @@ class EnhancedAgentOrchestrator:
                         # Could implement collaboration optimization logic here
                         agents_count = len(session['agents'])
                         if agents_count > 3:
-                            logger.info(f"🎯 Optimizing collaboration session {session_id} with {agents_count} agents")
+                            logger.debug("🎯 Optimizing collaboration session %s with %d agents", session_id, agents_count)
                 
             except Exception as e:
                 logger.error(f"Collaboration optimizer error: {e}")
@@ -902,11 +957,12 @@ class EnhancedAgentOrchestrator:
         if "plan" in message.lower() or "complex" in message.lower():
             response_content = "Recognized as a complex task, initiating planning phase (stub)."
             
+        # Built fresh per call: callers may mutate the nested list and dicts
         return {
             "response": {"content": response_content},
             "agents_involved": ["orchestrator_stub"],
             "decision_analysis": {"flow": "default_autonomous_stub", "reason": "mock"},
-            "create_checkpoint": True, # For testing checkpointing
+            "create_checkpoint": True,  # For testing checkpointing
             "significance_score": 0.8,
             "learning_opportunity": True
         }
@@ -916,16 +972,13 @@ class MamaBearAgent:
     
     def __init__(self, agent_id: str, specialist_variant, orchestrator):
         self.id = agent_id
+        self._variant_key = agent_id.split('_', 1)[0]  # e.g., 'research' from 'research_specialist'
         self.variant = specialist_variant
         self.orchestrator = orchestrator
         self.state = AgentState.IDLE
         self.current_task = None
         self.last_activity = datetime.now()
-        self.performance_metrics = {
-            'total_requests': 0,
-            'successful_requests': 0,
-            'average_response_time': 0.0
-        }
+        self.performance_metrics = AgentPerformance(avg_response_time=0.0)
     
     async def handle_request(self, message: str, user_id: str) -> Dict[str, Any]:
         """Handle a direct user request"""
@@ -933,7 +986,7 @@ class MamaBearAgent:
         start_time = datetime.now()
         self.state = AgentState.THINKING
         self.last_activity = start_time
-        self.performance_metrics['total_requests'] += 1
+        self.performance_metrics.requests += 1
         
         try:
             # Get context
@@ -951,14 +1004,15 @@ class MamaBearAgent:
             system_prompt = self.variant.get_system_prompt() if hasattr(self.variant, 'get_system_prompt') else f"You are {self.id}, a helpful AI assistant."
             
             # Build full prompt with context
-            context_str = ""
-            if relevant_context:
-                context_str = "\n\nRelevant context from previous conversations:\n"
-                for ctx in relevant_context:
-                    if 'content' in ctx and isinstance(ctx['content'], dict):
-                        user_msg = ctx['content'].get('user_message', '')
-                        agent_resp = ctx['content'].get('agent_response', '')
-                        context_str += f"- {user_msg}: {agent_resp}\n"
+            context_lines = [
+                f"- {ctx['content'].get('user_message', '')}: {ctx['content'].get('agent_response', '')}"
+                for ctx in relevant_context or []
+                if isinstance(ctx.get('content'), dict)
+            ]
+            context_str = (
+                "\n\nRelevant context from previous conversations:\n" + "\n".join(context_lines) + "\n"
+                if context_lines else ""
+            )
             
             full_prompt = f"""
             {system_prompt}
@@ -977,7 +1031,7 @@ class MamaBearAgent:
             # Get response using model manager
             result = await self.orchestrator.model_manager.get_response(
                 prompt=full_prompt,
-                mama_bear_variant=self.id.split('_')[0],  # e.g., 'research' from 'research_specialist'
+                mama_bear_variant=self._variant_key,
                 required_capabilities=['chat']
             )
             
@@ -985,12 +1039,12 @@ class MamaBearAgent:
             response_time = (datetime.now() - start_time).total_seconds()
             
             if result['success']:
-                self.performance_metrics['successful_requests'] += 1
+                self.performance_metrics.successful += 1
                 
                 # Update average response time
-                total_requests = self.performance_metrics['total_requests']
-                current_avg = self.performance_metrics['average_response_time']
-                self.performance_metrics['average_response_time'] = (
+                total_requests = self.performance_metrics.requests
+                current_avg = self.performance_metrics.avg_response_time
+                self.performance_metrics.avg_response_time = (
                     (current_avg * (total_requests - 1) + response_time) / total_requests
                 )
                 
@@ -1049,7 +1103,8 @@ class MamaBearAgent:
         """Handle messages from other agents"""
         
         # Process inter-agent communication
-        logger.info(f"Agent {self.id} received message from {message['from']}: {message['message']}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Agent %s received message from %s: %s", self.id, message['from'], message['message'])
         
         # Could trigger collaborative actions here
 
@@ -1109,41 +1164,51 @@ class LeadDeveloperAgent(MamaBearAgent):
         """Execute a plan created by the planning phase"""
         
         try:
-            executed_tasks = []
+            tasks = plan.get('tasks', [])
+            executed_tasks = [None] * len(tasks)
             
-            # Execute each task in the plan
-            for task_info in plan.get('tasks', []):
-                agent_id = task_info.get('agent', 'lead_developer')
-                task_description = task_info.get('description', '')
-                
-                # Get the appropriate agent
-                agent = self.orchestrator.agents.get(agent_id, self.orchestrator.agents.get('lead_developer')) # Access via orchestrator
+            # Group task indices into batches: independent tasks share a batch and run
+            # concurrently, a task declaring dependencies waits for everything before it
+            batches = []
+            for i, task_info in enumerate(tasks):
+                if not batches or task_info.get('dependencies'):
+                    batches.append([])
+                batches[-1].append(i)
+            
+            # Resolve the agent registry and fallback agent once for the whole plan
+            agents_map = self.orchestrator.agents # Access via orchestrator
+            fallback = agents_map.get('lead_developer')
+            
+            # Execute each batch of the plan
+            for batch in batches:
+                results = await asyncio.gather(
+                    *[
+                        self._execute_plan_task(
+                            agents_map.get(tasks[i].get('agent', 'lead_developer')) or fallback,
+                            tasks[i],
+                            user_id
+                        )
+                        for i in batch
+                    ],
+                    return_exceptions=True
+                )
                 
-                if agent:
-                    # Execute the task
-                    result = await agent.handle_request(task_description, user_id)
-                    executed_tasks.append({
-                        'agent_id': agent_id,
-                        'task': task_description,
-                        'result': result,
-                        'success': result.get('success', False)
-                    })
-                    
-                    # Track performance
-                    await self.orchestrator._track_agent_performance(agent_id, result.get('success', False)) # Access via orchestrator
-                else:
-                    executed_tasks.append({
-                        'agent_id': agent_id,
-                        'task': task_description,
-                        'result': {'success': False, 'error': f'Agent {agent_id} not found'},
-                        'success': False
-                    })
+                for i, result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        result = {
+                            'agent_id': tasks[i].get('agent', 'lead_developer'),
+                            'task': tasks[i].get('description', ''),
+                            'result': {'success': False, 'error': str(result)},
+                            'success': False
+                        }
+                    executed_tasks[i] = result
             
             # Synthesize plan execution results
-            successful_tasks = [t for t in executed_tasks if t['success']]
+            successful_count = sum(1 for t in executed_tasks if t['success'])
             
-            if successful_tasks:
+            if successful_count:
                 combined_content = f"I've executed the plan successfully! Here's what was accomplished:\n\n"
+                successful_tasks = (t for t in executed_tasks if t['success'])
                 for i, task in enumerate(successful_tasks):
                     combined_content += f"**Step {i+1} ({task['agent_id']}):**\n"
                     combined_content += f"{task['result'].get('content', 'Task completed')}\n\n"
@@ -1154,7 +1219,7 @@ class LeadDeveloperAgent(MamaBearAgent):
                     'content': combined_content,
                     'plan_id': plan.get('id'),
                     'executed_tasks': len(executed_tasks),
-                    'successful_tasks': len(successful_tasks),
+                    'successful_tasks': successful_count,
                     'metadata': {
                         'plan_title': plan.get('title'),
                         'task_details': executed_tasks
@@ -1179,6 +1244,33 @@ class LeadDeveloperAgent(MamaBearAgent):
                 'content': "I encountered an error while executing the plan. Let me help you in a simpler way!",
                 'error': str(e)
             }
+    
+    async def _execute_plan_task(self, agent, task_info: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+        """Execute a single plan task with its resolved agent"""
+        
+        agent_id = task_info.get('agent', 'lead_developer')
+        task_description = task_info.get('description', '')
+        
+        if not agent:
+            return {
+                'agent_id': agent_id,
+                'task': task_description,
+                'result': {'success': False, 'error': f'Agent {agent_id} not found'},
+                'success': False
+            }
+        
+        # Execute the task
+        result = await agent.handle_request(task_description, user_id)
+        
+        # Track performance
+        await self.orchestrator._track_agent_performance(agent_id, result.get('success', False)) # Access via orchestrator
+        
+        return {
+            'agent_id': agent_id,
+            'task': task_description,
+            'result': result,
+            'success': result.get('success', False)
+        }
  
 # Basic specialist classes as fallbacks
 class BasicResearchSpecialist:
@@ -5,10 +5,17 @@ for Scout.new-level autonomous operations.
 """
 
 import asyncio
+import collections
+import copy
+import hashlib
+import heapq
+import io
+import itertools
 import logging
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, field
 import json
+import re
 import time
 
 from .scrapybara_integration import (
@@ -19,8 +26,13 @@ from .scrapybara_integration import (
     create_scrapybara_orchestrator
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ComputerUseTask:
     """Represents a computer use task for autonomous execution"""
     task_id: str
@@ -30,22 +42,49 @@ class ComputerUseTask:
     context: Optional[Dict[str, Any]] = None
     requirements: Optional[Dict[str, Any]] = None
     expected_output: Optional[str] = None
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "task_id": self.task_id,
-            "description": self.description,
-            "task_type": self.task_type,
-            "priority": self.priority,
-            "context": self.context or {},
-            "requirements": self.requirements or {},
-            "expected_output": self.expected_output
-        }
+        # Tasks are immutable, so the dict is built once and reused
+        if self._cached_dict is None:
+            object.__setattr__(self, "_cached_dict", {
+                "task_id": self.task_id,
+                "description": self.description,
+                "task_type": self.task_type,
+                "priority": self.priority,
+                "context": self.context or {},
+                "requirements": self.requirements or {},
+                "expected_output": self.expected_output
+            })
+        return self._cached_dict
 
 
 class EnhancedMamaBearOrchestrator:
     """Enhanced orchestrator that combines Mama Bear intelligence with Scrapybara computer use"""
     
+    # Routing decision cache bounds
+    ROUTE_CACHE_SIZE = 1024
+    ROUTE_CACHE_MAX_DESCRIPTION = 512
+    # Descriptions longer than this are scanned in a worker thread
+    ANALYZE_OFFLOAD_THRESHOLD = 4096
+    # Inflections a routing keyword may carry and still match ("tests", "compiler")
+    KEYWORD_SUFFIXES = "s|es|d|ed|r|rs|er|ers|ing"
+    
+    # Max characters of a single context value forwarded to Scrapybara
+    CONTEXT_VALUE_LIMIT = 2048
+    # Most recent workflow step layers rendered into a task description; the
+    # caller's base context is always included as well
+    CONTEXT_LAYER_WINDOW = 3
+    
+    # Task history bounds
+    COMPLETED_TASK_HISTORY = 1000
+    RECENT_TASK_WINDOW = 10
+    # Results of idempotent tasks are reused for identical description/context
+    # for up to RESULT_CACHE_TTL seconds
+    RESULT_CACHE_SIZE = 256
+    RESULT_CACHE_TTL = 300
+    CACHEABLE_CATEGORIES = frozenset({"analysis", "planning"})
+    
     def __init__(self, 
                  mama_bear_orchestrator=None,
                  scrapybara_config: Optional[ScrapybaraConfig] = None):
@@ -59,12 +98,18 @@ class EnhancedMamaBearOrchestrator:
         self.scrapybara = ScrapybaraOrchestrator(scrapybara_config or ScrapybaraConfig())
         
         # Task management
-        self.pending_tasks: List[ComputerUseTask] = []
+        # Min-heap of (-priority, seq, task): highest priority first, FIFO within a priority
+        self.pending_tasks: List[Tuple[int, int, ComputerUseTask]] = []
+        self._task_seq = itertools.count()
+        # Suffix for task/workflow ids so ids stay unique within one clock tick
+        self._id_counter = itertools.count()
         self.active_tasks: Dict[str, ComputerUseTask] = {}
-        self.completed_tasks: List[Dict] = []
+        self.completed_tasks: collections.deque = collections.deque(maxlen=self.COMPLETED_TASK_HISTORY)
+        self._recent_success: collections.deque = collections.deque(maxlen=self.RECENT_TASK_WINDOW)
         
         # Intelligence integration
         self.task_routing_rules = self._setup_task_routing()
+        self._compile_task_routing()
         
     def _setup_task_routing(self) -> Dict[str, Dict]:
         """Setup rules for routing tasks between Mama Bear and Scrapybara"""
@@ -96,52 +141,180 @@ class EnhancedMamaBearOrchestrator:
             }
         }
     
+    def _compile_task_routing(self):
+        """Precompile the routing keywords into a single-pass matcher"""
+        # Categories are addressed by index so scoring works on a flat list
+        self._categories = list(self.task_routing_rules)
+        self._category_rules = [self.task_routing_rules[category] for category in self._categories]
+        self._inv_keyword_counts = [
+            1 / len(rules["keywords"]) if rules["keywords"] else 0.0
+            for rules in self._category_rules
+        ]
+        
+        self._keyword_categories: Dict[str, List[int]] = {}
+        for index, rules in enumerate(self._category_rules):
+            for keyword in rules["keywords"]:
+                self._keyword_categories.setdefault(keyword.lower(), []).append(index)
+        
+        # One alternation over every keyword, longest first, matched as a whole word
+        # with an optional inflection: "reinstall" no longer counts as "install" nor
+        # "typescript" as "type", while "screenshots" and "compiler" still count
+        alternation = "|".join(
+            re.escape(keyword) for keyword in sorted(self._keyword_categories, key=len, reverse=True)
+        )
+        self._keyword_pattern = re.compile(rf"\b({alternation})(?:{self.KEYWORD_SUFFIXES})?\b")
+        
+        # Routing decisions depend only on the rules, so drop any cached ones
+        self._route_cache: Dict[str, Dict[str, Any]] = {}
+        # LFU result cache: key -> [result, hits, monotonic expiry]; hit counts
+        # are halved every RESULT_CACHE_SIZE stores so old favourites age out
+        self._result_cache: Dict[Tuple[str, bytes], List[Any]] = {}
+        self._result_cache_stores = 0
+    
     def analyze_task_requirements(self, description: str) -> Dict[str, Any]:
         """Analyze task and determine optimal execution strategy"""
         description_lower = description.lower()
         
-        # Score each category
-        scores = {}
-        for category, rules in self.task_routing_rules.items():
-            score = sum(1 for keyword in rules["keywords"] if keyword in description_lower)
-            scores[category] = score
+        # Score each category by keyword occurrences found in one scan
+        score_vec = [0] * len(self._categories)
+        keyword_categories = self._keyword_categories
+        for keyword in self._keyword_pattern.findall(description_lower):
+            for index in keyword_categories[keyword]:
+                score_vec[index] += 1
         
-        # Find best match
-        best_category = max(scores.keys(), key=lambda k: scores[k]) if scores else "analysis"
-        best_score = scores.get(best_category, 0)
+        # Find best match; max() keeps the first category on ties, as before
+        best = max(range(len(score_vec)), key=score_vec.__getitem__)
         
         # Determine handler and instance type
-        rules = self.task_routing_rules.get(best_category, self.task_routing_rules["analysis"])
+        rules = self._category_rules[best]
         
         return {
-            "category": best_category,
-            "confidence": best_score / len(rules["keywords"]) if rules["keywords"] else 0,
+            "category": self._categories[best],
+            "confidence": min(1.0, score_vec[best] * self._inv_keyword_counts[best]),
             "handler": rules["handler"],
             "instance_type": rules.get("instance_type"),
-            "scores": scores
+            "scores": dict(zip(self._categories, score_vec))
         }
     
+    def queue_task(self, task: ComputerUseTask):
+        """Queue a computer use task for prioritized execution"""
+        heapq.heappush(self.pending_tasks, (-task.priority, next(self._task_seq), task))
+    
+    async def dispatch_pending_tasks(self) -> List[Dict[str, Any]]:
+        """Execute queued tasks, highest priority first"""
+        results = []
+        while self.pending_tasks:
+            _, _, task = heapq.heappop(self.pending_tasks)
+            self.active_tasks[task.task_id] = task
+            try:
+                results.append(await self.execute_autonomous_task(
+                    description=task.description,
+                    context=task.context
+                ))
+            finally:
+                self.active_tasks.pop(task.task_id, None)
+        return results
+    
+    def _cached_analyze(self, description: str) -> Dict[str, Any]:
+        """Analyze task requirements, reusing the decision for repeated descriptions"""
+        if len(description) > self.ROUTE_CACHE_MAX_DESCRIPTION:
+            return self.analyze_task_requirements(description)
+        
+        analysis = self._route_cache.get(description)
+        if analysis is None:
+            if len(self._route_cache) >= self.ROUTE_CACHE_SIZE:
+                # Evict the oldest decision
+                del self._route_cache[next(iter(self._route_cache))]
+            analysis = self.analyze_task_requirements(description)
+            self._route_cache[description] = analysis
+        return analysis
+    
+    def _result_cache_key(self, description: str, context: Optional[Dict[str, Any]]) -> Tuple[str, bytes]:
+        """Build a cache key from the description and a digest of the context"""
+        if isinstance(context, collections.ChainMap):
+            context = dict(context)
+        frozen_context = json.dumps(context, sort_keys=True, default=str).encode()
+        return description, hashlib.blake2b(frozen_context, digest_size=16).digest()
+    
+    def _get_cached_result(self, key: Tuple[str, bytes]) -> Optional[Dict[str, Any]]:
+        """Return a copy of a live cached result and bump its hit count"""
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= time.monotonic():
+            del self._result_cache[key]
+            return None
+        entry[1] += 1
+        return copy.deepcopy(entry[0])
+    
+    def _store_cached_result(self, key: Tuple[str, bytes], result: Dict[str, Any]):
+        """Cache a copy of a successful result, evicting the least frequently used entry"""
+        now = time.monotonic()
+        cache = self._result_cache
+        if key not in cache and len(cache) >= self.RESULT_CACHE_SIZE:
+            for expired in [k for k, entry in cache.items() if entry[2] <= now]:
+                del cache[expired]
+            if len(cache) >= self.RESULT_CACHE_SIZE:
+                # Ties go to the oldest entry
+                del cache[min(cache, key=lambda k: cache[k][1])]
+        
+        self._result_cache_stores += 1
+        if self._result_cache_stores >= self.RESULT_CACHE_SIZE:
+            self._result_cache_stores = 0
+            for entry in cache.values():
+                entry[1] >>= 1
+        
+        cache.pop(key, None)
+        cache[key] = [copy.deepcopy(result), 1, now + self.RESULT_CACHE_TTL]
+    
     async def execute_autonomous_task(self, 
                                     description: str,
                                     context: Optional[Dict[str, Any]] = None,
                                     force_handler: Optional[str] = None) -> Dict[str, Any]:
         """Execute autonomous task with intelligent routing"""
         
-        task_id = f"task_{int(time.time())}"
-        start_time = time.time()
-        
-        self.logger.info(f"Starting autonomous task: {task_id}")
-        self.logger.info(f"Task description: {description}")
+        task_id = f"task_{time.monotonic_ns()}_{next(self._id_counter)}"
+        start_time = time.monotonic()
         
         # Analyze task requirements
-        analysis = self.analyze_task_requirements(description)
-        handler = force_handler or analysis["handler"]
+        if force_handler:
+            # The caller picked the route, so skip the keyword scan
+            analysis = {
+                "category": None,
+                "confidence": 1.0,
+                "handler": force_handler,
+                "instance_type": InstanceType.UBUNTU if force_handler == "scrapybara" else None,
+                "scores": {}
+            }
+        elif len(description) > self.ANALYZE_OFFLOAD_THRESHOLD:
+            analysis = await asyncio.to_thread(self.analyze_task_requirements, description)
+        else:
+            analysis = self._cached_analyze(description)
+        handler = analysis["handler"]
+        
+        # One structured record per task start
+        self.logger.info(
+            "Starting autonomous task %s with handler %s", task_id, handler,
+            extra={
+                "task_id": task_id,
+                "task_description": description,
+                "task_analysis": analysis,
+                "handler": handler
+            }
+        )
         
-        self.logger.info(f"Task analysis: {analysis}")
-        self.logger.info(f"Using handler: {handler}")
+        # Only routed analysis/planning tasks are idempotent; a forced handler or any
+        # other category may act on the outside world
+        cache_key = None
+        if analysis["category"] in self.CACHEABLE_CATEGORIES:
+            cache_key = self._result_cache_key(description, context)
         
         try:
-            if handler == "scrapybara":
+            result = self._get_cached_result(cache_key) if cache_key else None
+            if result is not None:
+                self.logger.info("Reusing cached result for task: %s", task_id)
+            
+            elif handler == "scrapybara":
                 # Execute with Scrapybara computer use
                 result = await self._execute_with_scrapybara(
                     task_id=task_id,
@@ -170,8 +343,11 @@ class EnhancedMamaBearOrchestrator:
                     analysis=analysis
                 )
             
+            if cache_key and result.get("success", False):
+                self._store_cached_result(cache_key, result)
+            
             # Store result
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             task_result = {
                 "task_id": task_id,
                 "description": description,
@@ -183,7 +359,7 @@ class EnhancedMamaBearOrchestrator:
                 "success": result.get("success", False)
             }
             
-            self.completed_tasks.append(task_result)
+            self._record_task_result(task_result)
             
             return task_result
             
@@ -193,16 +369,35 @@ class EnhancedMamaBearOrchestrator:
                 "description": description,
                 "handler": handler,
                 "error": str(e),
-                "execution_time": time.time() - start_time,
+                "execution_time": time.monotonic() - start_time,
                 "timestamp": time.time(),
                 "success": False
             }
             
-            self.completed_tasks.append(error_result)
-            self.logger.error(f"Task {task_id} failed: {e}")
+            self._record_task_result(error_result)
+            self.logger.error("Task %s failed: %s", task_id, e)
             
             return error_result
     
+    def _context_window(self, context: Dict[str, Any]):
+        """Yield context items from the newest layers of a workflow ChainMap plus its base.
+        
+        The base layer is the caller's own context (topic, output location, ...),
+        which every step needs however many steps have run before it.
+        """
+        if not isinstance(context, collections.ChainMap):
+            yield from context.items()
+            return
+        
+        maps = context.maps
+        layers = maps if len(maps) <= self.CONTEXT_LAYER_WINDOW + 1 else maps[:self.CONTEXT_LAYER_WINDOW] + maps[-1:]
+        seen = set()
+        for layer in layers:
+            for k, v in layer.items():
+                if k not in seen:
+                    seen.add(k)
+                    yield k, v
+    
     async def _execute_with_scrapybara(self,
                                      task_id: str,
                                      description: str,
@@ -214,8 +409,17 @@ class EnhancedMamaBearOrchestrator:
         # Enhance description with context if available
         enhanced_description = description
         if context:
-            context_str = "\n".join(f"{k}: {v}" for k, v in context.items())
-            enhanced_description = f"{description}\n\nContext:\n{context_str}"
+            buf = io.StringIO()
+            buf.write(description)
+            buf.write("\n\nContext:\n")
+            for k, v in self._context_window(context):
+                if v is None or v == "":
+                    continue
+                buf.write(k)
+                buf.write(": ")
+                buf.write(str(v)[:self.CONTEXT_VALUE_LIMIT])
+                buf.write("\n")
+            enhanced_description = buf.getvalue().rstrip("\n")
         
         # Execute with Scrapybara
         result = await self.scrapybara.execute_autonomous_workflow(
@@ -226,13 +430,14 @@ class EnhancedMamaBearOrchestrator:
             }
         )
         
+        inner = result.get("result") or {}
         return {
             "success": result.get("success", False),
             "handler": "scrapybara",
             "scrapybara_result": result,
-            "instance_id": result.get("result", {}).get("instance_id"),
-            "text_output": result.get("result", {}).get("text", ""),
-            "steps": result.get("result", {}).get("steps", [])
+            "instance_id": inner.get("instance_id"),
+            "text_output": inner.get("text", ""),
+            "steps": inner.get("steps", [])
         }
     
     async def _execute_with_mama_bear(self,
@@ -272,40 +477,74 @@ class EnhancedMamaBearOrchestrator:
             }
             
         except Exception as e:
-            self.logger.error(f"Mama Bear execution failed: {e}")
+            self.logger.error("Mama Bear execution failed: %s", e)
             raise
     
     async def execute_multi_step_workflow(self, 
                                         workflow_steps: List[str],
-                                        context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute multi-step workflow with intelligent step routing"""
+                                        context: Optional[Dict[str, Any]] = None,
+                                        dependencies: Optional[Dict[int, List[int]]] = None) -> Dict[str, Any]:
+        """Execute multi-step workflow with intelligent step routing
         
-        workflow_id = f"workflow_{int(time.time())}"
-        results = []
-        overall_context = context or {}
+        ``dependencies`` maps a step index to the indices it needs first. Steps
+        whose dependencies are met run concurrently; without it every step
+        depends on the one before, as a plain sequential workflow.
+        """
         
-        self.logger.info(f"Starting multi-step workflow: {workflow_id}")
+        workflow_id = f"workflow_{time.monotonic_ns()}_{next(self._id_counter)}"
+        results: List[Optional[Dict[str, Any]]] = [None] * len(workflow_steps)
+        # Each successful step pushes a layer instead of growing one shared dict
+        overall_context = collections.ChainMap(context or {})
         
-        for i, step_description in enumerate(workflow_steps):
-            step_id = f"{workflow_id}_step_{i+1}"
-            
-            self.logger.info(f"Executing step {i+1}/{len(workflow_steps)}: {step_description}")
-            
-            # Execute step
-            step_result = await self.execute_autonomous_task(
-                description=step_description,
-                context=overall_context
+        if dependencies is None:
+            dependencies = {i: [i - 1] for i in range(1, len(workflow_steps))}
+        waves = _dependency_waves(len(workflow_steps), dependencies)
+        
+        self.logger.info("Starting multi-step workflow: %s", workflow_id)
+        
+        for wave in waves:
+            # Execute every ready step against the same context snapshot
+            wave_results = await asyncio.gather(
+                *[
+                    self.execute_autonomous_task(
+                        description=workflow_steps[i],
+                        context=overall_context
+                    )
+                    for i in wave
+                ],
+                return_exceptions=True
             )
             
-            results.append(step_result)
-            
-            # Update context with step results for next steps
-            if step_result.get("success"):
-                overall_context[f"step_{i+1}_result"] = step_result.get("text_output", "")
-            
-            # Stop if step failed and it's critical
-            if not step_result.get("success"):
-                self.logger.warning(f"Step {i+1} failed, continuing to next step")
+            for i, step_result in zip(wave, wave_results):
+                if isinstance(step_result, Exception):
+                    step_result = {
+                        "description": workflow_steps[i],
+                        "error": str(step_result),
+                        "success": False
+                    }
+                results[i] = step_result
+                success = step_result.get("success", False)
+                
+                # One structured record per step
+                self.logger.log(
+                    logging.INFO if success else logging.WARNING,
+                    "Workflow %s step %d/%d %s: %s",
+                    workflow_id, i + 1, len(workflow_steps),
+                    "completed" if success else "failed, continuing", workflow_steps[i],
+                    extra={
+                        "workflow_id": workflow_id,
+                        "step": i + 1,
+                        "task_id": step_result.get("task_id"),
+                        "success": success
+                    }
+                )
+                
+                # Update context with step results for next steps
+                if success:
+                    text_output = step_result.get("result", {}).get("text_output", "")
+                    overall_context = overall_context.new_child(
+                        {f"step_{i+1}_result": text_output[:self.CONTEXT_VALUE_LIMIT]}
+                    )
         
         # Summarize workflow results
         successful_steps = sum(1 for r in results if r.get("success"))
@@ -341,7 +580,7 @@ class EnhancedMamaBearOrchestrator:
             "instance_type": instance.instance_type.value,
             "timeout_hours": instance.timeout_hours,
             "created_at": instance.created_at,
-            "tools_available": [tool.__class__.__name__ for tool in instance.tools]
+            "tools_available": list(instance.tool_names)
         }
     
     def get_system_status(self) -> Dict[str, Any]:
@@ -358,15 +597,17 @@ class EnhancedMamaBearOrchestrator:
             "recent_task_success_rate": self._calculate_recent_success_rate()
         }
     
-    def _calculate_recent_success_rate(self, last_n_tasks: int = 10) -> float:
+    def _record_task_result(self, task_result: Dict[str, Any]):
+        """Append a finished task to the bounded task history"""
+        self.completed_tasks.append(task_result)
+        self._recent_success.append(bool(task_result.get("success", False)))
+    
+    def _calculate_recent_success_rate(self) -> float:
         """Calculate success rate for recent tasks"""
-        if not self.completed_tasks:
+        if not self._recent_success:
             return 0.0
         
-        recent_tasks = self.completed_tasks[-last_n_tasks:]
-        successful_tasks = sum(1 for task in recent_tasks if task.get("success", False))
-        
-        return successful_tasks / len(recent_tasks) if recent_tasks else 0.0
+        return sum(self._recent_success) / len(self._recent_success)
     
     async def save_browser_auth(self, instance_id: str, auth_name: str = "default") -> Optional[str]:
         """Save browser authentication state for reuse"""
@@ -377,6 +618,30 @@ class EnhancedMamaBearOrchestrator:
         return await self.scrapybara.manager.load_auth_state(instance_id, auth_state_id)
 
 
+def _dependency_waves(step_count: int, dependencies: Dict[int, List[int]]) -> List[List[int]]:
+    """Group step indices into waves whose dependencies are all in earlier waves (Kahn's algorithm)"""
+    
+    remaining = {i: set(dependencies.get(i, ())) for i in range(step_count)}
+    for i, deps in remaining.items():
+        unknown = [d for d in deps if not 0 <= d < step_count]
+        if unknown:
+            raise ValueError(f"Step {i} depends on unknown steps: {unknown}")
+    
+    waves = []
+    while remaining:
+        wave = [i for i, deps in remaining.items() if not deps]
+        if not wave:
+            raise ValueError(f"Circular step dependencies: {sorted(remaining)}")
+        
+        for i in wave:
+            del remaining[i]
+        for deps in remaining.values():
+            deps.difference_update(wave)
+        waves.append(wave)
+    
+    return waves
+
+
 # Integration helper functions
 def create_enhanced_orchestrator(mama_bear_orchestrator=None, **scrapybara_kwargs):
     """Create enhanced orchestrator with Mama Bear and Scrapybara integration"""
@@ -427,6 +692,15 @@ AUTONOMOUS_WORKFLOWS = {
     ]
 }
 
+# Step dependencies of AUTONOMOUS_WORKFLOWS: step index -> the steps it needs first.
+# Independent steps run concurrently.
+_WORKFLOW_DEPENDENCIES = {
+    "research_and_document": {1: [0], 2: [0], 3: [1, 2]},
+    "development_setup": {1: [0], 2: [1], 3: [2], 4: [3]},
+    "automated_testing": {1: [0], 2: [1], 3: [1, 2], 4: [3]},
+    "data_collection": {1: [0], 2: [1], 3: [2], 4: [3]}
+}
+
 
 async def execute_predefined_workflow(orchestrator: EnhancedMamaBearOrchestrator,
                                     workflow_name: str,
@@ -440,11 +714,23 @@ async def execute_predefined_workflow(orchestrator: EnhancedMamaBearOrchestrator
     
     return await orchestrator.execute_multi_step_workflow(
         workflow_steps=steps,
-        context=context
+        context=context,
+        dependencies=_WORKFLOW_DEPENDENCIES.get(workflow_name)
     )
 
 
 # Example usage and testing
+def _dumps_pretty(obj: Any) -> str:
+    """Serialize to indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str
+        ).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+
 async def main():
     """Example usage of enhanced orchestration"""
     
@@ -453,13 +739,13 @@ async def main():
     
     # Check system status
     status = orchestrator.get_system_status()
-    print("System Status:", json.dumps(status, indent=2))
+    print("System Status:", _dumps_pretty(status))
     
     # Execute a simple autonomous task
     result = await orchestrator.execute_autonomous_task(
         "Take a screenshot of the current desktop and describe what applications are visible"
     )
-    print("Task Result:", json.dumps(result, indent=2, default=str))
+    print("Task Result:", _dumps_pretty(result))
     
     # Execute a predefined workflow
     workflow_result = await execute_predefined_workflow(
@@ -467,7 +753,7 @@ async def main():
         "research_and_document",
         {"topic": "Python web frameworks", "output_location": "/tmp/research.md"}
     )
-    print("Workflow Result:", json.dumps(workflow_result, indent=2, default=str))
+    print("Workflow Result:", _dumps_pretty(workflow_result))
 
 
 if __name__ == "__main__":
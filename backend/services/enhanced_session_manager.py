@@ -4,17 +4,121 @@ Scout.new-level session persistence and state management for autonomous agents
 """
 
 import asyncio
+import base64
+import concurrent.futures
+import functools
+import hashlib
+import heapq
 import json
 import logging
-from typing import Dict, List, Optional, Any, Union
+import math
+import operator
+import os
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Dict, List, Optional, Any, Set, Tuple, Union, Deque
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
 import uuid
+import weakref
+import zlib
 from mem0 import Memory
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+def _json_dumps(obj: Any) -> str:
+    """Serialize a session payload, using orjson when it is installed"""
+    return _json_dumpb(obj).decode()
+
+def _json_dumpb(obj: Any) -> bytes:
+    """Serialize to UTF-8 bytes for hashing and compression, skipping a str round trip.
+    
+    Datetimes are written as isoformat() strings: natively by orjson (naive
+    values stay naive, so datetime.fromisoformat reads them back unchanged),
+    through _json_default otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_json_default).encode()
+
+def _json_default(obj: Any) -> Any:
+    """Encode the types json can't, matching orjson's output"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+try:
+    import zstandard
+    _STATE_ENCODING = "zstd+base64"
+    _zstd_compressor = zstandard.ZstdCompressor(level=3)
+    _compress = _zstd_compressor.compress
+except ImportError:
+    zstandard = None
+    _STATE_ENCODING = "zlib+base64"
+    _compress = zlib.compress
+
+def _encode_blob(raw: bytes) -> str:
+    """Compress and base64-encode bytes with the preferred codec"""
+    return base64.b64encode(_compress(raw)).decode("ascii")
+
+def _decode_blob(blob: str, encoding: str) -> bytes:
+    """Reverse _encode_blob for either codec"""
+    data = base64.b64decode(blob)
+    if encoding == "zstd+base64":
+        if zstandard is None:
+            raise ValueError("zstandard is required to read zstd-compressed session data")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if encoding == "zlib+base64":
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown session data encoding: {encoding}")
+
+def _memory_content(memory: Dict[str, Any]) -> str:
+    """Join the message contents of a Mem0 record; Mem0 keeps the payload in 'messages'"""
+    return "".join([
+        msg['content'] for msg in memory.get('messages', ())
+        if isinstance(msg, dict) and 'content' in msg
+    ])
+
+def _load_payload(content: str, encoding: Optional[str]) -> Any:
+    """Decode a stored record that is either plain JSON or an _encode_blob of JSON"""
+    if encoding and not content.startswith("{"):
+        return _json_loads(_decode_blob(content, encoding))
+    return _json_loads(content)
+
+# Crockford base32, as used by ULIDs
+_ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ULID_SHIFTS = tuple(range(125, -1, -5))
+_ulid_last_ms = 0
+_ulid_last_random = 0
+
+def _new_ulid() -> str:
+    """Generate a ULID: 48-bit millisecond timestamp plus 80 random bits.
+    
+    IDs sort lexicographically by creation time; IDs made within the same
+    millisecond increment the random part so they stay ordered.
+    """
+    global _ulid_last_ms, _ulid_last_random
+    
+    ms = time.time_ns() // 1_000_000
+    if ms <= _ulid_last_ms:
+        ms = _ulid_last_ms
+        random_bits = (_ulid_last_random + 1) & ((1 << 80) - 1)
+    else:
+        random_bits = int.from_bytes(os.urandom(10), "big")
+    _ulid_last_ms, _ulid_last_random = ms, random_bits
+    
+    value = (ms << 80) | random_bits
+    return "".join([_ULID_ALPHABET[(value >> shift) & 31] for shift in _ULID_SHIFTS])
+
 class SessionState(Enum):
     """Session states for autonomous agent execution"""
     ACTIVE = "active"
@@ -33,18 +137,65 @@ class SessionType(Enum):
     SCRAPYBARA = "scrapybara"            # Browser automation sessions
     WORKFLOW = "workflow"                 # Complex multi-step workflows
 
-@dataclass
+@dataclass(slots=True)
 class SessionCheckpoint:
     """Checkpoint data for resuming sessions"""
     checkpoint_id: str
     session_id: str
     timestamp: datetime
-    state_data: Dict[str, Any]
+    state_data: Optional[Dict[str, Any]]  # None until loaded from the checkpoint's own record
     progress_percentage: float
     description: str
     can_resume: bool = True
+    
+    # Delta checkpoints hold only the keys changed since parent_id in state_data
+    parent_id: Optional[str] = None
+    removed_keys: List[str] = field(default_factory=list)
+    
+    # Memoized to_dict(include_state=False) and its JSON, see summary()
+    _summary: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _summary_json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    
+    def summary(self) -> Dict[str, Any]:
+        """Stateless dict for embedding in session records, built once per checkpoint.
+        
+        Checkpoints are not modified after they are added to a session, so every
+        session write can reuse it; callers must treat it as read-only.
+        """
+        if self._summary is None:
+            self._summary = self.to_dict(include_state=False)
+        return self._summary
+    
+    def summary_json(self) -> bytes:
+        """summary() serialized once, so session writes only encode new checkpoints"""
+        if self._summary_json is None:
+            self._summary_json = _json_dumpb(self.summary())
+        return self._summary_json
+    
+    def to_dict(self, include_state: bool = True) -> Dict[str, Any]:
+        """Serialize to a dict for _json_dumpb without deep-copying"""
+        checkpoint_dict = {
+            "checkpoint_id": self.checkpoint_id,
+            "session_id": self.session_id,
+            "timestamp": self.timestamp,
+            "progress_percentage": self.progress_percentage,
+            "description": self.description,
+            "can_resume": self.can_resume,
+            "parent_id": self.parent_id,
+            "removed_keys": self.removed_keys
+        }
+        if include_state:
+            checkpoint_dict["state_data"] = self.state_data
+        return checkpoint_dict
+    
+    def __reduce__(self):
+        """Pickle as positional constructor arguments rather than a slot-name dict"""
+        return (SessionCheckpoint, _checkpoint_field_values(self))
 
-@dataclass 
+# Sessions keep their most recent checkpoints; older ones stay in their own Mem0 records
+MAX_SESSION_CHECKPOINTS = 32
+
+@dataclass(slots=True)
 class EnhancedSession:
     """Enhanced session with Scout.new-level capabilities"""
     session_id: str
@@ -67,7 +218,8 @@ class EnhancedSession:
     milestones: List[str] = field(default_factory=list) # Added for checkpointing
     
     # Long-running session features (Scout.new style)
-    checkpoints: List[SessionCheckpoint] = field(default_factory=list)
+    checkpoints: Deque[SessionCheckpoint] = field(default_factory=lambda: deque(maxlen=MAX_SESSION_CHECKPOINTS))  # oldest first
+    latest_checkpoint_ts: Optional[datetime] = None
     auto_checkpoint_interval: int = 300  # 5 minutes default
     max_runtime_hours: int = 24
     
@@ -83,20 +235,156 @@ class EnhancedSession:
     tokens_used: int = 0
     api_calls: int = 0
     cost_estimate: float = 0.0
+    
+    # checkpoint_id -> checkpoint for the checkpoints deque, see add_checkpoint
+    _checkpoint_index: Dict[str, SessionCheckpoint] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._checkpoint_index = {cp.checkpoint_id: cp for cp in self.checkpoints}
+    
+    def add_checkpoint(self, checkpoint: SessionCheckpoint):
+        """Append a checkpoint, dropping the oldest from the index when the deque is full"""
+        if len(self.checkpoints) == self.checkpoints.maxlen:
+            self._checkpoint_index.pop(self.checkpoints[0].checkpoint_id, None)
+        self.checkpoints.append(checkpoint)
+        self._checkpoint_index[checkpoint.checkpoint_id] = checkpoint
+        self.latest_checkpoint_ts = checkpoint.timestamp
+    
+    def get_checkpoint(self, checkpoint_id: str) -> Optional[SessionCheckpoint]:
+        """Look up one of the session's recent checkpoints by id"""
+        return self._checkpoint_index.get(checkpoint_id)
+    
+    def to_dict(self, include_checkpoints: bool = True) -> Dict[str, Any]:
+        """Serialize to a dict for _json_dumpb without deep-copying (datetimes are left to the serializer)"""
+        session_dict = {
+            "session_id": self.session_id,
+            "user_id": self.user_id,
+            "session_type": self.session_type.value,
+            "state": self.state.value,
+            "created_at": self.created_at,
+            "last_activity": self.last_activity,
+            "expires_at": self.expires_at,
+            "metadata": self.metadata,
+            "context": self.context,
+            "agent_id": self.agent_id,
+            "task_description": self.task_description,
+            "progress": self.progress,
+            "progress_percentage": self.progress_percentage,
+            "milestones": self.milestones,
+            "latest_checkpoint_ts": self.latest_checkpoint_ts,
+            "auto_checkpoint_interval": self.auto_checkpoint_interval,
+            "max_runtime_hours": self.max_runtime_hours,
+            "participants": self.participants,
+            "permissions": self.permissions,
+            "browser_session_id": self.browser_session_id,
+            "auth_states": self.auth_states,
+            "tokens_used": self.tokens_used,
+            "api_calls": self.api_calls,
+            "cost_estimate": self.cost_estimate
+        }
+        if include_checkpoints:
+            # State lives in each checkpoint's own record; sessions carry summaries
+            session_dict["checkpoints"] = [cp.summary() for cp in self.checkpoints]
+        return session_dict
+    
+    def __reduce__(self):
+        """Pickle as positional constructor arguments rather than a slot-name dict"""
+        return (EnhancedSession, _session_field_values(self))
+
+# Constructor field names and enum lookups used when rebuilding sessions from Mem0
+_SESSION_FIELD_NAMES = frozenset(f.name for f in fields(EnhancedSession) if f.init)
+_CHECKPOINT_FIELD_NAMES = frozenset(f.name for f in fields(SessionCheckpoint) if f.init)
+_SESSION_TYPE_BY_VALUE = {session_type.value: session_type for session_type in SessionType}
+_SESSION_STATE_BY_VALUE = {state.value: state for state in SessionState}
+_SESSION_DATETIME_FIELDS = ('created_at', 'last_activity', 'expires_at', 'latest_checkpoint_ts')
+_SESSION_ENUM_FIELDS = (('session_type', _SESSION_TYPE_BY_VALUE), ('state', _SESSION_STATE_BY_VALUE))
+
+# States get_user_sessions treats as live. A tuple rather than a set: tuple
+# membership checks identity first, while hashing an Enum member calls Enum.__hash__.
+_LIVE_SESSION_STATES = (SessionState.ACTIVE, SessionState.PAUSED)
+
+# All field values in __init__ order, for __reduce__
+_session_field_values = operator.attrgetter(*(f.name for f in fields(EnhancedSession) if f.init))
+_checkpoint_field_values = operator.attrgetter(*(f.name for f in fields(SessionCheckpoint) if f.init))
+
+def _construct(cls, field_names: frozenset, data: Dict[str, Any]):
+    """Build a dataclass from stored data, filtering keys only when the schema differs"""
+    # cls(**data) is as fast as positional construction: CPython binds keywords
+    # straight from the dict, while building a positional tuple costs a pass over it
+    if data.keys() == field_names:
+        return cls(**data)
+    # Records from another schema version: let __init__ fill defaults, drop unknown keys
+    return cls(**{key: value for key, value in data.items() if key in field_names})
 
 class EnhancedSessionManager:
     """Enhanced session manager using Mem0 for persistent sessions"""
     
+    # Session writes are coalesced and flushed to Mem0 in batches
+    WRITE_FLUSH_INTERVAL = 0.1  # seconds
+    WRITE_FLUSH_THRESHOLD = 50
+    
+    # A session write whose only change is last_activity moving within the
+    # same bucket of this many seconds is skipped
+    WRITE_ACTIVITY_RESOLUTION = 10
+    
+    # In-process session cache bounds (Mem0 remains the source of truth)
+    SESSION_CACHE_SIZE = 1024
+    SESSION_CACHE_TTL = 300  # seconds since last access
+    
+    # Threads for blocking Mem0 client calls; at most IO_QUEUE_DEPTH calls
+    # may be submitted at once so a slow Mem0 can't grow the queue unbounded
+    IO_POOL_WORKERS = 16
+    IO_QUEUE_DEPTH = 64
+    
+    # Decoding, parsing and compression run on a separate pool so they never
+    # wait behind Mem0 requests; search hits are parsed in chunks
+    CPU_POOL_WORKERS = 4
+    PARSE_CHUNK_SIZE = 25
+    
+    # Mem0 search results are reused for this long (seconds); stats
+    # dashboards poll the same query, so theirs live longer
+    SEARCH_CACHE_TTL = 30
+    STATS_SEARCH_TTL = 120
+    SEARCH_CACHE_SIZE = 512
+    
+    # Parsed sessions kept per Mem0 memory id so repeated scans skip decoding
+    SESSION_PARSE_CACHE_SIZE = 4096
+    
+    # Upper bound on search/delete rounds per cleanup run
+    CLEANUP_MAX_PASSES = 10
+    
+    # Cached wall-clock reads are refreshed at most this often (seconds)
+    CLOCK_RESOLUTION = 1.0
+    
+    # Long-running sessions get an intelligent checkpoint at least this often (seconds)
+    INTELLIGENT_CHECKPOINT_INTERVAL = 1800
+    
+    # Background services retry after a failure with exponential backoff
+    # from ERROR_BACKOFF_MIN up to ERROR_BACKOFF_MAX seconds
+    ERROR_BACKOFF_MIN = 60
+    ERROR_BACKOFF_MAX = 600
+    
+    # Context checkpoints between full snapshots; the rest store only changed keys
+    CHECKPOINT_DELTA_CHAIN = 10
+    
+    # Checkpoint state at least this many bytes of JSON is stored compressed
+    STATE_COMPRESS_MIN_BYTES = 1024
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         
+        # Session records of STATE_COMPRESS_MIN_BYTES or more are stored compressed.
+        # Off by default: Mem0 can only search content it can read as text.
+        self.compress_sessions = bool(config.get("SESSION_COMPRESS_PAYLOADS", False))
+        
         # Initialize Mem0 client properly
         self.memory = None
+        self._http_client = None
         try:
             from mem0 import MemoryClient
             mem0_api_key = config.get("MEM0_API_KEY")
             if mem0_api_key:
-                self.memory = MemoryClient(api_key=mem0_api_key)
+                self.memory = self._create_mem0_client(MemoryClient, mem0_api_key)
                 logger.info("✅ Session Manager Mem0 client initialized")
             else:
                 logger.warning("⚠️ No MEM0_API_KEY provided for session manager")
@@ -104,11 +392,87 @@ class EnhancedSessionManager:
             logger.warning(f"⚠️ Failed to initialize Mem0 client in session manager: {e}")
             self.memory = None
         
-        # Active session cache for performance
-        self.active_sessions: Dict[str, EnhancedSession] = {}
+        # Active session cache for performance: LRU order with an idle TTL.
+        # Pinned sessions (monitored long-running ones) are never evicted.
+        self.active_sessions: "OrderedDict[str, EnhancedSession]" = OrderedDict()
+        self._session_touched: Dict[str, float] = {}
+        self._pinned_sessions: Set[str] = set()
+        
+        # Monitored long-running sessions: session_id -> next check (monotonic),
+        # with a heap of (deadline, session_id) served by one monitor task that
+        # sleeps until the earliest expiry or auto checkpoint is due
+        self._monitored: Dict[str, float] = {}
+        self._monitor_heap: List[Tuple[float, str]] = []
+        # Both are created on the loop that runs the monitor, see _ensure_monitor_task()
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._monitor_wakeup: Optional[asyncio.Event] = None
+        
+        # Mem0's client is synchronous, so its calls run here instead of on the event loop
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.IO_POOL_WORKERS,
+            thread_name_prefix="session-mem0"
+        )
+        
+        # One IO_QUEUE_DEPTH semaphore per event loop: callers may each run in their
+        # own loop, and an asyncio.Semaphore is bound to the first loop that waits on it
+        self._io_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        
+        self._cpu_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.CPU_POOL_WORKERS,
+            thread_name_prefix="session-cpu"
+        )
+        
+        # Coalesced wall-clock reads for hot paths, see _now()
+        self._clock_now = datetime.now()
+        self._clock_tick = time.monotonic()
+        
+        # Latest stored context checkpoint per session: (checkpoint_id, key digests, chain depth).
+        # Queued checkpoints wait in _unconfirmed_bases (checkpoint_id -> (session_id, key
+        # digests, chain depth)) and only become a delta base once Mem0 accepts the write.
+        self._checkpoint_bases: Dict[str, Tuple[str, Dict[str, bytes], int]] = {}
+        self._unconfirmed_bases: Dict[str, Tuple[str, Dict[str, bytes], int]] = {}
+        
+        # Cached Mem0 searches: (query, limit) -> (monotonic time, results),
+        # plus the keys each tag ("user:<id>", "session:<id>", "all") covers
+        self._search_cache: Dict[Tuple[str, int], Tuple[float, List[Any]]] = {}
+        self._search_cache_tags: Dict[str, Set[Tuple[str, int]]] = {}
         
-        # Background tasks
-        self._background_tasks = set()
+        # Mem0 memory id -> (updated_at/hash, parsed session), see _materialize_sessions
+        self._session_parse_cache: Dict[str, Tuple[Any, EnhancedSession]] = {}
+        
+        # Intelligent checkpointing: heap of (due, session_id) for long-running
+        # sessions, with session_id -> due for the live entry
+        self._checkpoint_heap: List[Tuple[float, str]] = []
+        self._checkpoint_due: Dict[str, float] = {}
+        # Created on the loop that runs the service, see _ensure_checkpoint_service()
+        self._checkpoint_task: Optional[asyncio.Task] = None
+        self._checkpoint_wakeup: Optional[asyncio.Event] = None
+        
+        # Mem0 loads in progress, keyed by session_id or "user:<user_id>"
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # Monotonic expiry and next auto-checkpoint deadlines for monitored sessions
+        self._expiry_deadlines: Dict[str, float] = {}
+        self._auto_checkpoint_deadlines: Dict[str, float] = {}
+        
+        # Current retry delay for monitored sessions whose last check failed
+        self._monitor_backoff: Dict[str, float] = {}
+        
+        # Local secondary indexes over the cached sessions: user_id -> session ids,
+        # session type -> session ids. They grow and shrink with the LRU cache;
+        # _indexed_users holds the users whose sessions are all cached.
+        self._user_index: Dict[str, Set[str]] = {}
+        self._type_index: Dict[SessionType, Set[str]] = {}
+        self._indexed_users: Set[str] = set()
+        
+        # Sessions waiting to be written to Mem0, keyed by session_id (last write wins)
+        self._pending_writes: Dict[str, EnhancedSession] = {}
+        
+        # Digest of each session's last queued write, see _session_write_payload
+        self._written_digests: Dict[str, bytes] = {}
+        self._pending_checkpoint_writes: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_wakeup: Optional[asyncio.Event] = None
         
         logger.info("🚀 Enhanced Session Manager initialized with Mem0")
     
@@ -123,9 +487,9 @@ class EnhancedSessionManager:
     ) -> EnhancedSession:
         """Create a new enhanced session"""
         
-        session_id = f"session_{uuid.uuid4().hex[:8]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        session_id = f"session_{_new_ulid()}"
         
-        now = datetime.now()
+        now = self._read_clock()
         expires_at = now + timedelta(hours=max_runtime_hours) if session_type == SessionType.LONG_RUNNING else None
         
         session = EnhancedSession(
@@ -146,7 +510,7 @@ class EnhancedSessionManager:
         await self._store_session_to_mem0(session)
         
         # Cache for quick access
-        self.active_sessions[session_id] = session
+        self._cache_session(session)
         
         # Start background monitoring for long-running sessions
         if session_type == SessionType.LONG_RUNNING:
@@ -160,17 +524,15 @@ class EnhancedSessionManager:
         """Get session from cache or Mem0"""
         
         # Check cache first
-        if session_id in self.active_sessions:
-            session = self.active_sessions[session_id]
-            session.last_activity = datetime.now()
+        session = self._get_cached_session(session_id)
+        if session:
+            session.last_activity = self._now()
             return session
         
-        # Load from Mem0
-        session = await self._load_session_from_mem0(session_id)
+        # Load from Mem0, sharing the load with concurrent callers
+        session = await self._coalesced(session_id, self._load_and_cache_session, session_id)
         if session:
-            # Add to cache
-            self.active_sessions[session_id] = session
-            session.last_activity = datetime.now()
+            session.last_activity = self._now()
         
         return session
     
@@ -187,23 +549,35 @@ class EnhancedSessionManager:
             logger.warning(f"Session {session_id} not found for update")
             return False
         
-        # Apply updates
+        previous_progress, previous_state = session.progress, session.state
+        
+        # Apply updates; sessions are slotted, so only known fields can be set
         for key, value in updates.items():
-            if hasattr(session, key):
+            if key in _SESSION_FIELD_NAMES:
                 setattr(session, key, value)
             else:
-                session.metadata[key] = value
+                logger.warning(f"Ignoring unknown field '{key}' in update for session {session_id}")
+        
+        now = self._now()
+        session.last_activity = now
         
-        session.last_activity = datetime.now()
+        # Reschedule monitoring if the updates moved its deadlines
+        if session_id in self._monitored and ('expires_at' in updates or 'auto_checkpoint_interval' in updates):
+            self._schedule_monitor_check(session_id, self._refresh_monitor_deadlines(session))
         
         # Create checkpoint if requested or if it's been a while
+        persisted = False
         if (create_checkpoint or 
             session.session_type == SessionType.LONG_RUNNING and
-            self._should_auto_checkpoint(session)):
-            await self.create_checkpoint(session_id, f"Auto checkpoint at {datetime.now()}")
+            self._should_auto_checkpoint(session, now)):
+            persisted = await self.create_checkpoint(session_id, f"Auto checkpoint at {now}") is not None
+        elif (getattr(self, 'intelligent_checkpointing_enabled', False) and
+              self._should_intelligent_checkpoint(session, previous_progress, previous_state)):
+            persisted = await self._create_intelligent_checkpoint(session)
         
-        # Update in Mem0
-        await self._store_session_to_mem0(session)
+        # Update in Mem0, unless a checkpoint already stored the session
+        if not persisted:
+            await self._store_session_to_mem0(session)
         
         return True
     
@@ -219,23 +593,44 @@ class EnhancedSessionManager:
         if not session:
             return None
         
-        checkpoint_id = f"cp_{uuid.uuid4().hex[:8]}"
+        checkpoint_id = f"cp_{_new_ulid()}"
         checkpoint = SessionCheckpoint(
             checkpoint_id=checkpoint_id,
             session_id=session_id,
-            timestamp=datetime.now(),
-            state_data=state_data or session.context.copy(),
+            timestamp=self._read_clock(),
+            state_data=None,
             progress_percentage=session.progress,
             description=description
         )
         
-        session.checkpoints.append(checkpoint)
+        # Context checkpoints are stored as deltas against the latest stored one,
+        # with a full snapshot every CHECKPOINT_DELTA_CHAIN checkpoints
+        state = state_data or session.context
+        digests = {key: self._state_digest(value) for key, value in state.items()}
+        base = self._checkpoint_bases.get(session_id)
+        if state_data is None and base is not None and base[2] < self.CHECKPOINT_DELTA_CHAIN:
+            parent_id, parent_digests, depth = base
+            checkpoint.parent_id = parent_id
+            checkpoint.state_data = {
+                key: state[key] for key, digest in digests.items()
+                if parent_digests.get(key) != digest
+            }
+            checkpoint.removed_keys = [key for key in parent_digests if key not in digests]
+            depth += 1
+        else:
+            checkpoint.state_data = state_data or session.context.copy()
+            depth = 0
+        self._unconfirmed_bases[checkpoint_id] = (session_id, digests, depth)
         
-        # Store checkpoint in Mem0
-        await self._store_checkpoint_to_mem0(checkpoint)
+        session.add_checkpoint(checkpoint)
+        self._reset_auto_checkpoint_deadline(session)
         
-        # Update session
-        await self._store_session_to_mem0(session)
+        # Store the checkpoint and the updated session together; the session
+        # write is queued while the checkpoint state is compressed
+        await asyncio.gather(
+            self._store_checkpoint_to_mem0(checkpoint),
+            self._store_session_to_mem0(session)
+        )
         
         logger.info(f"📍 Created checkpoint {checkpoint_id} for session {session_id}: {description}")
         
@@ -255,21 +650,31 @@ class EnhancedSessionManager:
         # Get the checkpoint (latest if not specified)
         checkpoint = None
         if checkpoint_id:
-            checkpoint = next((cp for cp in session.checkpoints if cp.checkpoint_id == checkpoint_id), None)
+            checkpoint = session.get_checkpoint(checkpoint_id)
+            if checkpoint is None:
+                # Older checkpoints only live in their own Mem0 records
+                checkpoint = await self._load_checkpoint(checkpoint_id)
+                if checkpoint is not None and checkpoint.session_id != session_id:
+                    checkpoint = None
         else:
             # Get latest checkpoint
+            # Checkpoints are appended in creation order
             if session.checkpoints:
-                checkpoint = max(session.checkpoints, key=lambda x: x.timestamp)
+                checkpoint = session.checkpoints[-1]
         
         if not checkpoint:
             logger.warning(f"No valid checkpoint found for session {session_id}")
             return None
         
+        state = await self._resolve_checkpoint_state(session, checkpoint)
+        if state is None:
+            return None
+        
         # Restore state from checkpoint
-        session.context.update(checkpoint.state_data)
+        session.context.update(state)
         session.progress = checkpoint.progress_percentage
         session.state = SessionState.ACTIVE
-        session.last_activity = datetime.now()
+        session.last_activity = self._now()
         
         await self._store_session_to_mem0(session)
         
@@ -281,45 +686,37 @@ class EnhancedSessionManager:
         self, 
         user_id: str, 
         session_type: Optional[SessionType] = None,
-        active_only: bool = True
+        active_only: bool = True,
+        limit: Optional[int] = 50
     ) -> List[EnhancedSession]:
-        """Get all sessions for a user"""
+        """Get a user's most recently active sessions (all of them if limit is None)"""
         
         try:
-            # Search Mem0 for user sessions
-            search_query = f"user:{user_id} category:session"
-            if session_type:
-                search_query += f" session_type:{session_type.value}"
+            # Idle sessions past the TTL drop out of the cache (and the index) here
+            for session_id in list(self._user_index.get(user_id, ())):
+                if self._get_cached_session(session_id) is None:
+                    self._indexed_users.discard(user_id)
             
-            memories = self.memory.search(search_query, limit=50)
+            # A user seen for the first time, or with sessions evicted since, is
+            # reloaded from Mem0 with a single search
+            if user_id not in self._indexed_users:
+                await self._coalesced(f"user:{user_id}", self._build_user_index, user_id)
             
-            sessions = []
-            for memory in memories:
-                try:
-                    # Mem0 stores the primary content in 'messages' not 'memory'
-                    messages_content = memory.get('messages', [])
-                    session_data_str = ""
-                    for msg in messages_content:
-                        if isinstance(msg, dict) and 'content' in msg:
-                            session_data_str += msg['content'] # Reconstruct the original dict string
-                    
-                    session_data = json.loads(session_data_str)
-                    if 'session_id' in session_data:
-                        session = self._dict_to_session(session_data)
-                        
-                        if active_only and session.state not in [SessionState.ACTIVE, SessionState.PAUSED]:
-                            continue
-                            
-                        sessions.append(session)
-                except json.JSONDecodeError as jde:
-                    logger.warning(f"Failed to parse session JSON from memory {memory.get('id', 'unknown')}: {jde}. Content: {memory.get('messages', 'N/A')}")
-                    continue
-                except Exception as e:
-                    logger.warning(f"Failed to parse session from memory {memory.get('id', 'unknown')}: {e}")
-                    continue
+            session_ids = self._user_index.get(user_id, set())
+            if session_type:
+                session_ids = session_ids & self._type_index.get(session_type, set())
+            
+            loaded = await asyncio.gather(*[self._peek_session(session_id) for session_id in session_ids])
+            sessions = (
+                session for session in loaded
+                if session and not (active_only and session.state not in _LIVE_SESSION_STATES)
+            )
             
-            # Sort by last_activity. Use .get() defensively for potentially missing attributes.
-            return sorted(sessions, key=lambda x: x.last_activity if hasattr(x, 'last_activity') else datetime.min, reverse=True)
+            # Most recent first; only the top `limit` are kept while scanning
+            by_activity = operator.attrgetter('last_activity')
+            if limit is None:
+                return sorted(sessions, key=by_activity, reverse=True)
+            return heapq.nlargest(limit, sessions, key=by_activity)
         except Exception as e:
             logger.error(f"Error getting user sessions: {e}")
             return []
@@ -330,114 +727,135 @@ class EnhancedSessionManager:
         logger.info("🧹 Starting session cleanup...")
         
         try:
-            # Search for all sessions
-            memories = self.memory.search("category:session", limit=100)
-            
             cleaned_count = 0
-            for memory in memories:
-                try:
-                    # Mem0 stores the primary content in 'messages' not 'memory'
-                    messages_content = memory.get('messages', [])
-                    session_data_str = ""
-                    for msg in messages_content:
-                        if isinstance(msg, dict) and 'content' in msg:
-                            session_data_str += msg['content'] # Reconstruct the original dict string
+            
+            # Deleted rows drop out of the search, so each pass reaches rows
+            # the previous one's limit cut off
+            for _ in range(self.CLEANUP_MAX_PASSES):
+                memories = await self._run_io(self.memory.search, "category:session", limit=100)
+                
+                # Group the stored versions by session; only the newest one
+                # decides expiry, since older versions predate any extension
+                # or resume
+                versions: Dict[str, List[str]] = defaultdict(list)
+                newest: Dict[str, EnhancedSession] = {}
+                for memory, session in self._materialize_sessions(memories, "during cleanup"):
+                    memory_id = memory.get('id')
+                    if memory_id:
+                        versions[session.session_id].append(memory_id)
+                    current = newest.get(session.session_id)
+                    if current is None or session.last_activity > current.last_activity:
+                        newest[session.session_id] = session
+                
+                now = self._now()
+                expired: Dict[str, EnhancedSession] = {}
+                for session_id, session in newest.items():
+                    # A cached session is the current version, stored or not
+                    session = self.active_sessions.get(session_id, session)
+                    
+                    # Check if expired
+                    if (session.expires_at and now > session.expires_at) or \
+                       (session.state is SessionState.COMPLETED and (now - session.last_activity).days > 7):
+                        expired[session_id] = session
+                
+                if not expired:
+                    break
+                
+                for session in expired.values():
+                    # Drop from cache and indexes
+                    self._stop_monitoring(session.session_id)
+                    self._evict_cached_session(session.session_id)
                     
+                    # Keep old completed work recoverable before deleting it
+                    if session.state == SessionState.COMPLETED:
+                        await self._archive_session(session)
                     
-                    session_data = json.loads(session_data_str)
-                    if 'session_id' in session_data:
-                        session = self._dict_to_session(session_data)
-                        
-                        # Check if expired
-                        now = datetime.now()
-                        if (session.expires_at and now > session.expires_at) or \
-                           (hasattr(session, 'state') and session.state == SessionState.COMPLETED and
-                            hasattr(session, 'last_activity') and (now - session.last_activity).days > 7):
-                            
-                            # Mark as expired in cache
-                            if session.session_id in self.active_sessions:
-                                del self.active_sessions[session.session_id]
-                            
-                            logger.info(f"Marked session {session.session_id} for cleanup (expired/old)")
-                            cleaned_count += 1
-                            # NOTE: Actual deletion from Mem0 would require Mem0's delete functionality,
-                            # which might involve searching by metadata. For now, it's a soft delete/remove from cache.
-                            
-                except json.JSONDecodeError as jde:
-                    logger.warning(f"Failed to parse session JSON during cleanup for memory {memory.get('id', 'unknown')}: {jde}. Content: {memory.get('messages', 'N/A')}")
-                    continue
-                except Exception as e:
-                    logger.warning(f"Failed to process session during cleanup for memory {memory.get('id', 'unknown')}: {e}")
-                    continue
+                    logger.info(f"Removing session {session.session_id} (expired/old)")
+                
+                # Once the newest version has expired, its older versions go too
+                memory_ids = [memory_id for session_id in expired for memory_id in versions[session_id]]
+                await self._delete_memories(memory_ids)
+                cleaned_count += len(expired)
+                
+                if not memory_ids:
+                    break
+            
+            if cleaned_count:
+                self._search_cache.clear()
+                self._search_cache_tags.clear()
             
             logger.info(f"🧹 Cleaned up {cleaned_count} expired sessions")
             
         except Exception as e:
             logger.error(f"Error during session cleanup: {e}")
     
+    async def _archive_session(self, session: EnhancedSession):
+        """Store a compressed copy of a session under the session_archive category"""
+        
+        try:
+            raw = _json_dumpb(session.to_dict())
+            blob = await self._run_cpu(_encode_blob, raw)
+            
+            await self._run_io(
+                self.memory.add,
+                messages=[{"role": "system", "content": blob}],
+                user_id=session.user_id,
+                metadata={
+                    "category": "session_archive",
+                    "session_id": session.session_id,
+                    "encoding": _STATE_ENCODING,
+                    "timestamp": session.last_activity.isoformat()
+                }
+            )
+        except Exception as e:
+            logger.error(f"Failed to archive session {session.session_id}: {e}")
+    
+    async def _delete_memories(self, memory_ids: List[str]):
+        """Delete Mem0 records, in one request when the client supports it"""
+        
+        if not memory_ids:
+            return
+        
+        for memory_id in memory_ids:
+            self._session_parse_cache.pop(memory_id, None)
+        
+        batch_delete = getattr(self.memory, "batch_delete", None)
+        if batch_delete is not None:
+            try:
+                await self._run_io(batch_delete, [{"memory_id": memory_id} for memory_id in memory_ids])
+                return
+            except Exception as e:
+                logger.warning(f"Mem0 batch_delete failed, falling back to single deletes: {e}")
+        
+        results = await asyncio.gather(
+            *[self._run_io(self.memory.delete, memory_id) for memory_id in memory_ids],
+            return_exceptions=True
+        )
+        for memory_id, result in zip(memory_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to delete memory {memory_id}: {result}")
+    
     async def get_session_stats(self, user_id: Optional[str] = None) -> Dict[str, Any]:
         """Get session statistics"""
         
         try:
             query = f"user:{user_id} category:session" if user_id else "category:session"
-            memories = self.memory.search(query, limit=200)
-            
-            stats = {
-                'total_sessions': 0,
-                'active_sessions': 0,
-                'long_running_sessions': 0,
-                'total_tokens_used': 0,
-                'total_api_calls': 0,
-                'total_cost_estimate': 0.0,
-                'session_types': {},
-                'average_session_duration_hours': 0.0
-            }
+            memories = await self._cached_search(
+                query, 200, f"user:{user_id}" if user_id else "all", ttl=self.STATS_SEARCH_TTL
+            )
             
-            durations = []
+            # Each chunk returns partial counters that are merged here
+            chunk_results = await self._map_memory_chunks(self._session_stats_chunk, memories)
             
-            for memory in memories:
-                try:
-                    # Mem0 stores the primary content in 'messages' not 'memory'
-                    messages_content = memory.get('messages', [])
-                    session_data_str = ""
-                    for msg in messages_content:
-                        if isinstance(msg, dict) and 'content' in msg:
-                            session_data_str += msg['content'] # Reconstruct the original dict string
-                    
-                    
-                    session_data = json.loads(session_data_str)
-                    if 'session_id' in session_data:
-                        session = self._dict_to_session(session_data)
-                        
-                        stats['total_sessions'] += 1
-                        
-                        if hasattr(session, 'state') and session.state == SessionState.ACTIVE:
-                            stats['active_sessions'] += 1
-                        
-                        if hasattr(session, 'session_type') and session.session_type == SessionType.LONG_RUNNING:
-                            stats['long_running_sessions'] += 1
-                        
-                        stats['total_tokens_used'] += getattr(session, 'tokens_used', 0)
-                        stats['total_api_calls'] += getattr(session, 'api_calls', 0)
-                        stats['total_cost_estimate'] += getattr(session, 'cost_estimate', 0.0)
-                        
-                        # Session type distribution
-                        if hasattr(session, 'session_type'):
-                            session_type = session.session_type.value
-                            stats['session_types'][session_type] = stats['session_types'].get(session_type, 0) + 1
-                        
-                        # Duration calculation
-                        if hasattr(session, 'state') and session.state in [SessionState.COMPLETED, SessionState.FAILED] and \
-                           hasattr(session, 'last_activity') and hasattr(session, 'created_at'):
-                            duration = (session.last_activity - session.created_at).total_seconds() / 3600
-                            durations.append(duration)
-                        
-                except json.JSONDecodeError as jde:
-                    logger.warning(f"Failed to parse session JSON for stats for memory {memory.get('id', 'unknown')}: {jde}. Content: {memory.get('messages', 'N/A')}")
-                    continue
-                except Exception as e:
-                    logger.warning(f"Failed to process session for stats for memory {memory.get('id', 'unknown')}: {e}")
-                    continue
+            stats = self._empty_session_stats()
+            durations = []
+            for partial, partial_durations in chunk_results:
+                for key in ('total_sessions', 'active_sessions', 'long_running_sessions',
+                            'total_tokens_used', 'total_api_calls', 'total_cost_estimate'):
+                    stats[key] += partial[key]
+                for session_type, count in partial['session_types'].items():
+                    stats['session_types'][session_type] = stats['session_types'].get(session_type, 0) + count
+                durations.extend(partial_durations)
             
             if durations:
                 stats['average_session_duration_hours'] = sum(durations) / len(durations)
@@ -448,6 +866,180 @@ class EnhancedSessionManager:
             logger.error(f"Error getting session stats: {e}")
             return {}
     
+    async def _build_user_index(self, user_id: str):
+        """Cache all of the user's sessions, and so index them, from a single Mem0 search"""
+        
+        memories = await self._run_io(self.memory.search, f"user:{user_id} category:session", limit=50)
+        chunk_results = await self._map_memory_chunks(self._parse_user_sessions_chunk, memories, False)
+        
+        # Mem0 keeps every stored version; keep the newest per session
+        newest: Dict[str, EnhancedSession] = {}
+        for chunk in chunk_results:
+            for session in chunk:
+                current = newest.get(session.session_id)
+                if current is None or session.last_activity > current.last_activity:
+                    newest[session.session_id] = session
+        
+        for session_id, session in newest.items():
+            # A queued write is newer than anything Mem0 returned
+            if session_id not in self.active_sessions:
+                self._cache_session(self._pending_writes.get(session_id, session))
+        
+        # Complete only if the cache could hold them all; users without sessions are not
+        # remembered, which keeps _indexed_users bounded by the cache
+        if self._user_index.get(user_id) and all(session_id in self.active_sessions for session_id in newest):
+            self._indexed_users.add(user_id)
+    
+    async def _peek_session(self, session_id: str) -> Optional[EnhancedSession]:
+        """Get a session without marking it as active"""
+        
+        session = self._get_cached_session(session_id)
+        if session is None:
+            session = await self._coalesced(session_id, self._load_and_cache_session, session_id)
+        return session
+    
+    async def _load_and_cache_session(self, session_id: str) -> Optional[EnhancedSession]:
+        """Load a session from Mem0 and add it to the cache"""
+        
+        session = await self._load_session_from_mem0(session_id)
+        if session:
+            self._cache_session(session)
+        return session
+    
+    async def _coalesced(self, key: str, func, *args):
+        """Run func(*args) once per key; concurrent callers await the same load"""
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A cancelled caller must not cancel the load other callers share
+        return await asyncio.shield(task)
+    
+    def _index_session(self, session: EnhancedSession):
+        self._user_index.setdefault(session.user_id, set()).add(session.session_id)
+        self._type_index.setdefault(session.session_type, set()).add(session.session_id)
+    
+    def _unindex_session(self, session: EnhancedSession):
+        user_sessions = self._user_index.get(session.user_id)
+        if user_sessions is not None:
+            user_sessions.discard(session.session_id)
+            if not user_sessions:
+                del self._user_index[session.user_id]
+        self._type_index.get(session.session_type, set()).discard(session.session_id)
+    
+    async def _map_memory_chunks(self, func, memories, *args) -> List[Any]:
+        """Run func over fixed-size chunks of Mem0 search hits on the CPU pool"""
+        
+        memories = list(memories or [])
+        loop = asyncio.get_running_loop()
+        size = self.PARSE_CHUNK_SIZE
+        return await asyncio.gather(*[
+            loop.run_in_executor(self._cpu_pool, func, memories[i:i + size], *args)
+            for i in range(0, len(memories), size)
+        ])
+    
+    def _materialize_sessions(self, memories: List[Dict[str, Any]], purpose: str, use_cache: bool = True):
+        """Yield (memory, session) for session search hits, parsing each stored record once.
+        
+        Parsed sessions are memoized by Mem0 memory id and the record's
+        updated_at/hash, so repeated scans of the same records skip JSON decoding.
+        Memoized sessions are shared snapshots of the stored record: callers that
+        keep a session live (and so mutate it) must pass use_cache=False.
+        """
+        
+        for memory in memories:
+            if memory.get('metadata', {}).get('category', 'session') != 'session':
+                continue
+            
+            memory_id = memory.get('id')
+            etag = memory.get('updated_at') or memory.get('hash')
+            # Records without an id or version can't be told apart from their updates
+            cacheable = use_cache and memory_id is not None and etag is not None
+            cached = self._session_parse_cache.get(memory_id) if cacheable else None
+            if cached is not None and cached[0] == etag:
+                yield memory, cached[1]
+                continue
+            
+            try:
+                session_data = _load_payload(_memory_content(memory), memory.get('metadata', {}).get('encoding'))
+                if 'session_id' not in session_data:
+                    continue
+                session = self._dict_to_session(session_data)
+            except json.JSONDecodeError as jde:
+                logger.warning(f"Failed to parse session JSON {purpose} for memory {memory.get('id', 'unknown')}: {jde}. Content: {memory.get('messages', 'N/A')}")
+                continue
+            except Exception as e:
+                logger.warning(f"Failed to parse session {purpose} for memory {memory.get('id', 'unknown')}: {e}")
+                continue
+            
+            if cacheable:
+                if len(self._session_parse_cache) >= self.SESSION_PARSE_CACHE_SIZE:
+                    self._session_parse_cache.clear()
+                self._session_parse_cache[memory_id] = (etag, session)
+            yield memory, session
+    
+    def _parse_user_sessions_chunk(self, memories: List[Dict[str, Any]], active_only: bool) -> List[EnhancedSession]:
+        """Parse one chunk of session search hits for get_user_sessions"""
+        
+        # These sessions go into the live cache, so they must not be shared with the parse cache
+        return [
+            session for _, session in self._materialize_sessions(memories, "for user sessions", use_cache=False)
+            if not (active_only and session.state not in _LIVE_SESSION_STATES)
+        ]
+    
+    @staticmethod
+    def _empty_session_stats() -> Dict[str, Any]:
+        return {
+            'total_sessions': 0,
+            'active_sessions': 0,
+            'long_running_sessions': 0,
+            'total_tokens_used': 0,
+            'total_api_calls': 0,
+            'total_cost_estimate': 0.0,
+            'session_types': {},
+            'average_session_duration_hours': 0.0
+        }
+    
+    def _session_stats_chunk(self, memories: List[Dict[str, Any]]):
+        """Aggregate partial stats and completed-session durations for one chunk"""
+        
+        stats = self._empty_session_stats()
+        session_types = stats['session_types']
+        durations = []
+        active = long_running = tokens = api_calls = 0
+        cost = 0.0
+        
+        # Every field read here is declared on EnhancedSession and filled by _dict_to_session
+        for _, session in self._materialize_sessions(memories, "for stats"):
+            state = session.state
+            session_type = session.session_type
+            
+            if state is SessionState.ACTIVE:
+                active += 1
+            elif state is SessionState.COMPLETED or state is SessionState.FAILED:
+                durations.append((session.last_activity - session.created_at).total_seconds() / 3600)
+            
+            if session_type is SessionType.LONG_RUNNING:
+                long_running += 1
+            
+            tokens += session.tokens_used
+            api_calls += session.api_calls
+            cost += session.cost_estimate
+            
+            # Session type distribution
+            session_types[session_type.value] = session_types.get(session_type.value, 0) + 1
+        
+        stats['total_sessions'] = sum(session_types.values())
+        stats['active_sessions'] = active
+        stats['long_running_sessions'] = long_running
+        stats['total_tokens_used'] = tokens
+        stats['total_api_calls'] = api_calls
+        stats['total_cost_estimate'] = cost
+        
+        return stats, durations
+    
     async def enable_intelligent_checkpointing(self):
         """Enable intelligent automatic checkpointing for autonomous sessions"""
         
@@ -457,61 +1049,126 @@ class EnhancedSessionManager:
         self.intelligent_checkpointing_enabled = True
         
         # Start background checkpointing service
-        asyncio.create_task(self._intelligent_checkpointing_service())
+        self._ensure_checkpoint_service()
         
         logger.info("✅ Intelligent checkpointing enabled")
     
     async def _intelligent_checkpointing_service(self):
         """Background service for intelligent checkpointing"""
         
-        while getattr(self, 'intelligent_checkpointing_enabled', False):
+        # Long-running sessions are seeded here if checkpointing is enabled
+        # after they were cached
+        for session in list(self.active_sessions.values()):
+            self._schedule_intelligent_checkpoint(session)
+        
+        backoff = self.ERROR_BACKOFF_MIN
+        # A service left on another loop stops once _ensure_checkpoint_service replaces it
+        while (getattr(self, 'intelligent_checkpointing_enabled', False) and
+               self._checkpoint_task is asyncio.current_task()):
             try:
-                await asyncio.sleep(300)  # Check every 5 minutes
+                # Sleep until the earliest due session, or until an earlier one is scheduled
+                timeout = self._checkpoint_heap[0][0] - time.monotonic() if self._checkpoint_heap else None
+                if timeout is None or timeout > 0:
+                    self._checkpoint_wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._checkpoint_wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
                 
-                current_time = datetime.now()
+                due, session_id = heapq.heappop(self._checkpoint_heap)
+                if self._checkpoint_due.get(session_id) != due:
+                    continue  # Rescheduled or evicted since it was pushed
+                del self._checkpoint_due[session_id]
                 
-                # Check all active sessions for checkpointing opportunities
-                for session_id, session in self.active_sessions.items():
-                    try:
-                        # Check if session needs checkpointing
-                        should_checkpoint = False
-                        
-                        # Time-based checkpointing (every 30 minutes for long-running tasks)
-                        if session.session_type == SessionType.LONG_RUNNING:
-                            last_checkpoint = session.created_at
-                            if session.checkpoints:
-                                last_checkpoint = max(cp.timestamp for cp in session.checkpoints)
-                            
-                            if (current_time - last_checkpoint) > timedelta(minutes=30):
-                                should_checkpoint = True
-                        
-                        # Progress-based checkpointing
-                        if hasattr(session, 'progress') and session.progress > 0 and session.progress % 25 == 0:
-                            # Checkpoint at 25%, 50%, 75%, etc.
-                            should_checkpoint = True
-                        
-                        # State-change based checkpointing
-                        if hasattr(session, 'state') and session.state == SessionState.PAUSED:
-                            should_checkpoint = True
-                        
-                        if should_checkpoint:
-                            await self._create_intelligent_checkpoint(session)
-                    
-                    except Exception as e:
-                        logger.error(f"Error in intelligent checkpointing for session {session_id}: {e}")
+                session = self.active_sessions.get(session_id)
+                if session is None:
+                    continue
+                
+                try:
+                    # Time-based checkpointing (every 30 minutes for long-running tasks)
+                    last_checkpoint = session.latest_checkpoint_ts or session.created_at
+                    if (self._now() - last_checkpoint).total_seconds() >= self.INTELLIGENT_CHECKPOINT_INTERVAL:
+                        await self._create_intelligent_checkpoint(session)
+                except Exception as e:
+                    logger.error(f"Error in intelligent checkpointing for session {session_id}: {e}")
+                
+                self._schedule_intelligent_checkpoint(session)
+                backoff = self.ERROR_BACKOFF_MIN
                 
             except Exception as e:
-                logger.error(f"Intelligent checkpointing service error: {e}")
-                await asyncio.sleep(60)
+                logger.error(f"Intelligent checkpointing service error: {e}; retrying in {backoff}s")
+                await asyncio.sleep(backoff)
+                backoff = self._next_backoff(backoff)
+    
+    def _schedule_intelligent_checkpoint(self, session: EnhancedSession):
+        """Queue a long-running session for its next time-based checkpoint"""
+        
+        if session.session_type != SessionType.LONG_RUNNING:
+            return
+        
+        last_checkpoint = session.latest_checkpoint_ts or session.created_at
+        remaining = self.INTELLIGENT_CHECKPOINT_INTERVAL - (self._now() - last_checkpoint).total_seconds()
+        due = time.monotonic() + max(0.0, remaining)
+        
+        self._checkpoint_due[session.session_id] = due
+        heapq.heappush(self._checkpoint_heap, (due, session.session_id))
+        if (not self._ensure_checkpoint_service() and self._checkpoint_wakeup is not None and
+                self._checkpoint_heap[0] == (due, session.session_id)):
+            self._checkpoint_wakeup.set()
+    
+    def _ensure_checkpoint_service(self) -> bool:
+        """Start the checkpointing service on the running loop unless it already runs there.
+        
+        Returns True if it was (re)started. Like the session monitor, the wakeup event
+        is created with the task so it is bound to the loop that waits on it.
+        """
+        if not getattr(self, 'intelligent_checkpointing_enabled', False):
+            return False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False  # Started by the next caller that runs in a loop
+        task = self._checkpoint_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return False
+        self._checkpoint_wakeup = asyncio.Event()
+        self._checkpoint_task = loop.create_task(self._intelligent_checkpointing_service())
+        return True
     
-    async def _create_intelligent_checkpoint(self, session: EnhancedSession):
-        """Create an intelligent checkpoint with context analysis"""
+    def _should_intelligent_checkpoint(
+        self, 
+        session: EnhancedSession, 
+        previous_progress: float, 
+        previous_state: SessionState
+    ) -> bool:
+        """Check whether an update reached a checkpoint-worthy milestone"""
+        
+        # Progress-based checkpointing: checkpoint at 25%, 50%, 75%, etc.
+        if session.progress != previous_progress and session.progress > 0 and session.progress % 25 == 0:
+            return True
+        
+        # State-change based checkpointing
+        return session.state != previous_state and session.state == SessionState.PAUSED
+    
+    async def _create_intelligent_checkpoint(self, session: EnhancedSession) -> bool:
+        """Create an intelligent checkpoint with context analysis.
+        
+        Returns True once the checkpoint exists; create_checkpoint stores the
+        session with it, so callers need not store the session again.
+        """
         
         try:
-            # Analyze current state
+            # Analyze current state. Only what resuming needs is captured: the
+            # full session (with its checkpoint history) would grow every checkpoint
             checkpoint_data = {
-                'session_state': asdict(session),
-                'timestamp': datetime.now().isoformat(),
+                'session_state': {
+                    'context': session.context,
+                    'progress': session.progress,
+                    'milestones': list(session.milestones),
+                    'state': session.state.value
+                },
+                'timestamp': self._now().isoformat(),
                 'progress_analysis': {
                     'completion_percentage': getattr(session, 'progress', 0.0),
                     'key_milestones': getattr(session, 'milestones', []),
@@ -524,122 +1181,430 @@ class EnhancedSessionManager:
                 }
             }
             
-            # Create checkpoint
-            checkpoint_id = f"checkpoint_{datetime.now().timestamp()}"
-            checkpoint = SessionCheckpoint(
-                checkpoint_id=checkpoint_id,
-                session_id=session.session_id,
-                timestamp=datetime.now(),
-                # Ensure state_data is a dict or None, not a dataclass instance
-                state_data=checkpoint_data, # This is a dict, so it's correct
-                progress_percentage=getattr(session, 'progress', 0.0),
-                description=f"Intelligent checkpoint - {getattr(session, 'progress', 0.0)}% complete"
-            )
-            
-            # Store checkpoint - ensure arguments match create_checkpoint signature
-            await self.create_checkpoint(
+            checkpoint = await self.create_checkpoint(
                 session.session_id,
-                checkpoint.description, # `description` is the second argument
-                checkpoint.state_data # `state_data` is the third argument
+                f"Intelligent checkpoint - {getattr(session, 'progress', 0.0)}% complete",
+                checkpoint_data
             )
             
             logger.info(f"📸 Created intelligent checkpoint for session {session.session_id}")
+            return checkpoint is not None
             
         except Exception as e:
             logger.error(f"Failed to create intelligent checkpoint: {e}")
+            return False
 
     # Private methods
     
+    def _now(self) -> datetime:
+        """Wall-clock time, re-read at most once per CLOCK_RESOLUTION seconds"""
+        
+        if time.monotonic() - self._clock_tick >= self.CLOCK_RESOLUTION:
+            return self._read_clock()
+        return self._clock_now
+    
+    def _read_clock(self) -> datetime:
+        """Read the wall clock exactly and refresh the cached value"""
+        
+        # Keeps _now() from ever returning a time before an exact read
+        self._clock_now = datetime.now()
+        self._clock_tick = time.monotonic()
+        return self._clock_now
+    
+    def _get_cached_session(self, session_id: str) -> Optional[EnhancedSession]:
+        """Return a cached session, dropping it if it has sat idle past the TTL"""
+        
+        session = self.active_sessions.get(session_id)
+        if session is None:
+            return None
+        
+        now = time.monotonic()
+        if (session_id not in self._pinned_sessions and
+                now - self._session_touched[session_id] > self.SESSION_CACHE_TTL):
+            self._evict_cached_session(session_id)
+            return None
+        
+        self.active_sessions.move_to_end(session_id)
+        self._session_touched[session_id] = now
+        return session
+    
+    def _cache_session(self, session: EnhancedSession):
+        """Cache a session, evicting idle sessions and the least recently used unpinned one when full"""
+        
+        session_id = session.session_id
+        self.active_sessions[session_id] = session
+        self.active_sessions.move_to_end(session_id)
+        self._session_touched[session_id] = time.monotonic()
+        self._index_session(session)
+        
+        if (session_id not in self._checkpoint_due and
+                getattr(self, 'intelligent_checkpointing_enabled', False)):
+            self._schedule_intelligent_checkpoint(session)
+        
+        # Drop idle sessions from the LRU end, then the oldest one if still full.
+        # Pinned sessions are rotated to the back as they are passed over so they
+        # don't pile up at the LRU end and turn every eviction into a scan
+        idle_cutoff = time.monotonic() - self.SESSION_CACHE_TTL
+        for _ in range(len(self.active_sessions)):
+            candidate = next(iter(self.active_sessions))
+            if candidate in self._pinned_sessions:
+                self.active_sessions.move_to_end(candidate)
+            elif (self._session_touched[candidate] < idle_cutoff or
+                    len(self.active_sessions) > self.SESSION_CACHE_SIZE):
+                self._evict_cached_session(candidate)
+            else:
+                break
+    
+    def _evict_cached_session(self, session_id: str):
+        """Remove a session from the in-process cache and the local indexes"""
+        session = self.active_sessions.pop(session_id, None)
+        if session is not None:
+            self._unindex_session(session)
+            # The user's index is incomplete until it is reloaded from Mem0
+            self._indexed_users.discard(session.user_id)
+        self._session_touched.pop(session_id, None)
+        self._written_digests.pop(session_id, None)
+        # The next checkpoint after a reload starts a new full snapshot
+        self._checkpoint_bases.pop(session_id, None)
+        self._checkpoint_due.pop(session_id, None)
+    
     async def _store_session_to_mem0(self, session: EnhancedSession):
-        """Store session to Mem0 for persistence"""
+        """Queue session for persistence to Mem0"""
+        
+        if self.memory is None:
+            logger.debug(f"No Mem0 client, skipping store for session {session.session_id}")
+            return
+        
+        # Repeated updates to one session collapse into a single write
+        self._pending_writes[session.session_id] = session
+        self._invalidate_searches(session.user_id, session.session_id)
+        self._schedule_flush()
+    
+    async def _cached_search(self, query: str, limit: int, tag: Optional[str] = None, ttl: Optional[float] = None) -> List[Any]:
+        """Mem0 search that reuses results younger than the TTL"""
+        
+        key = (query, limit)
+        cached = self._search_cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < (ttl or self.SEARCH_CACHE_TTL):
+            return cached[1]
+        
+        results = await self._run_io(self.memory.search, query, limit=limit)
+        
+        if len(self._search_cache) >= self.SEARCH_CACHE_SIZE:
+            self._prune_search_cache()
+        self._search_cache[key] = (time.monotonic(), results)
+        if tag is not None:
+            self._search_cache_tags.setdefault(tag, set()).add(key)
+        return results
+    
+    def _prune_search_cache(self):
+        """Drop expired searches, or everything if the cache is still full"""
+        
+        cutoff = time.monotonic() - max(self.SEARCH_CACHE_TTL, self.STATS_SEARCH_TTL)
+        self._search_cache = {key: entry for key, entry in self._search_cache.items() if entry[0] > cutoff}
+        if len(self._search_cache) >= self.SEARCH_CACHE_SIZE:
+            self._search_cache.clear()
+        for tag in list(self._search_cache_tags):
+            self._search_cache_tags[tag] &= self._search_cache.keys()
+            if not self._search_cache_tags[tag]:
+                del self._search_cache_tags[tag]
+    
+    def _invalidate_searches(self, user_id: str, session_id: str):
+        """Drop cached searches that a write to this session makes stale"""
+        
+        for tag in (f"user:{user_id}", f"session:{session_id}", "all"):
+            for key in self._search_cache_tags.pop(tag, ()):
+                self._search_cache.pop(key, None)
+    
+    def _schedule_flush(self):
+        """Start the flusher, or wake it early once enough writes are queued"""
+        
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_wakeup = asyncio.Event()
+            self._flush_task = asyncio.create_task(self._flush_pending_writes_loop())
+        elif len(self._pending_writes) + len(self._pending_checkpoint_writes) >= self.WRITE_FLUSH_THRESHOLD:
+            self._flush_wakeup.set()
+    
+    async def _flush_pending_writes_loop(self):
+        """Flush queued session writes every interval until the queue drains"""
         
         try:
-            session_dict = self._session_to_dict(session)
-            session_description = (
-                f"Session {session.session_id}: {session.session_type.value} session "
-                f"for user {session.user_id}. State: {session.state.value}. "
-                f"Created: {session.created_at.isoformat()}"
-            )
-            
-            if session.task_description:
-                session_description += f". Task: {session.task_description}"
-            
-            metadata = {
-                "category": "session",
-                "session_id": session.session_id,
-                "user_id": session.user_id,
-                "session_type": session.session_type.value,
-                "state": session.state.value,
-                "timestamp": session.last_activity.isoformat(),
-                "agent_id": session.agent_id or "none"
-            }
-            
-            # Mem0's `add` method stores the `messages` list. If session_dict is huge, it might exceed limits.
-            # Convert session_dict to a JSON string and store it as content in a single message.
-            session_json_content = json.dumps(session_dict)
-            
-            self.memory.add(
-                messages=[{"role": "system", "content": session_json_content}],
-                user_id=session.user_id,
-                metadata=metadata
+            while self._pending_writes or self._pending_checkpoint_writes:
+                try:
+                    await asyncio.wait_for(self._flush_wakeup.wait(), timeout=self.WRITE_FLUSH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_wakeup.clear()
+                writes = self._take_pending_writes()
+                if writes:
+                    await self._dispatch_writes(writes)
+        finally:
+            # Don't lose queued writes if the loop is cancelled on shutdown
+            writes = self._take_pending_writes()
+            if writes:
+                self._settle_checkpoint_writes(writes, self._send_writes(writes))
+    
+    async def flush_pending_writes(self):
+        """Write all queued sessions to Mem0 now"""
+        writes = self._take_pending_writes()
+        if writes:
+            await self._dispatch_writes(writes)
+    
+    async def close(self):
+        """Stop the background tasks, flush queued writes and release the Mem0 I/O and CPU threads"""
+        # Stop the tasks that queue writes first so the final flush sees everything;
+        # the flusher goes last. Tasks left on an earlier loop died with it.
+        await self._cancel_background_tasks(self._monitor_task, self._checkpoint_task)
+        await self.flush_pending_writes()
+        await self._cancel_background_tasks(self._flush_task)
+        
+        # Waiting for in-flight Mem0 calls must not block the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self._shutdown_pools)
+        if self._http_client is not None:
+            self._http_client.close()
+    
+    @staticmethod
+    async def _cancel_background_tasks(*tasks: Optional[asyncio.Task]):
+        """Cancel the given tasks that run on this loop and wait for them to finish"""
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in tasks if task is not None and not task.done() and task.get_loop() is loop]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _shutdown_pools(self):
+        """Shut down the I/O and CPU pools once their queued work is done"""
+        self._io_pool.shutdown(wait=True)
+        self._cpu_pool.shutdown(wait=True)
+    
+    def _create_mem0_client(self, client_cls, api_key: str):
+        """Build the Mem0 client on a keep-alive connection pool sized to the I/O pool"""
+        
+        try:
+            import httpx
+            self._http_client = httpx.Client(
+                timeout=300,
+                limits=httpx.Limits(
+                    max_connections=self.IO_POOL_WORKERS * 2,
+                    max_keepalive_connections=self.IO_POOL_WORKERS
+                )
             )
-            
+            return client_cls(api_key=api_key, client=self._http_client)
+        except (ImportError, TypeError):
+            # mem0 releases without the client argument keep their own httpx.Client
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+            return client_cls(api_key=api_key)
+    
+    async def _run_io(self, func, *args, **kwargs):
+        """Run a blocking Mem0 client call on the I/O thread pool"""
+        loop = asyncio.get_running_loop()
+        io_slots = self._io_slots.get(loop)
+        if io_slots is None:
+            io_slots = self._io_slots[loop] = asyncio.Semaphore(self.IO_QUEUE_DEPTH)
+        async with io_slots:
+            return await loop.run_in_executor(self._io_pool, functools.partial(func, *args, **kwargs))
+    
+    async def _run_cpu(self, func, *args):
+        """Run decoding, parsing or compression work on the CPU thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._cpu_pool, func, *args)
+    
+    def _take_pending_writes(self) -> List[Dict[str, Any]]:
+        """Drain the write queue into Mem0 add() payloads"""
+        
+        # Checkpoints go out in the same batch as the sessions that reference them
+        writes = self._pending_checkpoint_writes
+        self._pending_checkpoint_writes = []
+        
+        if not self._pending_writes:
+            return writes
+        
+        # Serialized here, on the event loop, so no coroutine mutates a session mid-dump
+        sessions = list(self._pending_writes.values())
+        self._pending_writes = {}
+        
+        for session in sessions:
+            try:
+                write = self._session_write_payload(session)
+                if write is not None:
+                    writes.append(write)
+            except Exception as e:
+                logger.error(f"Failed to serialize session {session.session_id}: {e}")
+        return writes
+    
+    def _send_writes(self, writes: List[Dict[str, Any]]) -> List[bool]:
+        """Send session writes to Mem0, batched when the client supports it; returns which were stored"""
+        
+        batch_add = getattr(self.memory, "batch_add", None)
+        if batch_add is not None:
+            try:
+                batch_add(writes)
+                return [True] * len(writes)
+            except Exception as e:
+                logger.warning(f"Mem0 batch_add failed, falling back to single writes: {e}")
+        
+        return [self._add_write(write) for write in writes]
+    
+    async def _dispatch_writes(self, writes: List[Dict[str, Any]]):
+        """Send writes from the I/O pool; without batch_add, single adds run in parallel"""
+        
+        if getattr(self.memory, "batch_add", None) is not None:
+            stored = await self._run_io(self._send_writes, writes)
+        else:
+            stored = await asyncio.gather(*[self._run_io(self._add_write, write) for write in writes])
+        self._settle_checkpoint_writes(writes, stored)
+        
+        # Searches made while the writes were in flight may have cached old versions
+        for write in writes:
+            metadata = write["metadata"]
+            if metadata.get("category") == "session":
+                self._invalidate_searches(metadata["user_id"], metadata["session_id"])
+    
+    def _add_write(self, write: Dict[str, Any]) -> bool:
+        """Send one queued write to Mem0, logging failures"""
+        try:
+            self.memory.add(**write)
+            return True
         except Exception as e:
-            logger.error(f"Failed to store session to Mem0: {e}")
+            logger.error(f"Failed to write {write['metadata'].get('category', 'record')} to Mem0: {e}")
+            return False
+    
+    def _settle_checkpoint_writes(self, writes: List[Dict[str, Any]], stored: List[bool]):
+        """Make stored checkpoints the delta base for their session; failed ones never become one"""
+        
+        for write, ok in zip(writes, stored):
+            metadata = write["metadata"]
+            if metadata.get("category") != "checkpoint":
+                continue
+            checkpoint_id = metadata["checkpoint_id"]
+            pending = self._unconfirmed_bases.pop(checkpoint_id, None)
+            if not ok or pending is None:
+                continue
+            session_id, digests, depth = pending
+            # Evicted sessions start over with a full snapshot; ULID ids sort by creation
+            base = self._checkpoint_bases.get(session_id)
+            if session_id in self.active_sessions and (base is None or base[0] < checkpoint_id):
+                self._checkpoint_bases[session_id] = (checkpoint_id, digests, depth)
+            if write['metadata'].get('category') == 'session':
+                # Let the next identical write through
+                self._written_digests.pop(write['metadata']['session_id'], None)
+    
+    def _session_write_payload(self, session: EnhancedSession) -> Optional[Dict[str, Any]]:
+        """Build the Mem0 add() arguments for a session, or None if Mem0 already has it"""
+        
+        # Checkpoint summaries are spliced in from their cached JSON, so only
+        # checkpoints added since they were last written get encoded
+        session_dict = session.to_dict(include_checkpoints=False)
+        last_activity = session_dict.pop("last_activity")
+        body = b"%s,\"checkpoints\":[%s]}" % (
+            _json_dumpb(session_dict)[:-1],
+            b",".join([cp.summary_json() for cp in session.checkpoints])
+        )
+        
+        activity_bucket = int(session.last_activity.timestamp() // self.WRITE_ACTIVITY_RESOLUTION)
+        hasher = hashlib.blake2b(body, digest_size=16)
+        hasher.update(activity_bucket.to_bytes(8, "big", signed=True))
+        digest = hasher.digest()
+        if self._written_digests.get(session.session_id) == digest:
+            return None
+        self._written_digests[session.session_id] = digest
+        
+        metadata = {
+            "category": "session",
+            "session_id": session.session_id,
+            "user_id": session.user_id,
+            "session_type": session.session_type.value,
+            "state": session.state.value,
+            "timestamp": session.last_activity.isoformat(),
+            "agent_id": session.agent_id or "none"
+        }
+        
+        # Mem0's `add` method stores the `messages` list. If session_dict is huge, it might exceed limits.
+        # Convert session_dict to a JSON string and store it as content in a single message.
+        # last_activity is appended to the already-serialized object rather than dumping twice
+        session_json = b"%s,\"last_activity\":%s}" % (body[:-1], _json_dumpb(last_activity))
+        if self.compress_sessions and len(session_json) >= self.STATE_COMPRESS_MIN_BYTES:
+            session_json_content = _encode_blob(session_json)
+            metadata["encoding"] = _STATE_ENCODING
+        else:
+            session_json_content = session_json.decode()
+        
+        return {
+            "messages": [{"role": "system", "content": session_json_content}],
+            "user_id": session.user_id,
+            "metadata": metadata
+        }
     
     async def _load_session_from_mem0(self, session_id: str) -> Optional[EnhancedSession]:
         """Load session from Mem0"""
         
+        # A queued write is newer than anything Mem0 has
+        pending = self._pending_writes.get(session_id)
+        if pending is not None:
+            return pending
+        
         try:
-            memories = self.memory.search(f"session_id:{session_id}", limit=1)
+            memories = await self._cached_search(f"session_id:{session_id}", 1, f"session:{session_id}")
             
             if not memories:
                 logger.debug(f"No memories found for session_id: {session_id}")
                 return None
             
-            # Mem0 stores the actual data in the 'messages' field as a list of dictionaries.
-            # Assuming the first message's content holds the session JSON.
-            memory_entry = memories[0]
-            if not isinstance(memory_entry, dict):
-                logger.warning(f"Unexpected memory entry format: {memory_entry}. Skipping.")
-                return None
-
-            messages_list = memory_entry.get('messages', [])
-            if not messages_list:
-                logger.warning(f"No messages found in memory entry for session {session_id}.")
-                return None
-            
-            session_data_str = ""
-            for msg in messages_list:
-                if isinstance(msg, dict) and 'content' in msg:
-                    session_data_str += msg['content'] # Reconstruct the original dict string
-            
-            if not session_data_str:
-                logger.warning(f"Empty session data string from memory for session {session_id}.")
-                return None
-
-            session_data = json.loads(session_data_str)
-            return self._dict_to_session(session_data)
-            
-        except json.JSONDecodeError as jde:
-            logger.error(f"Failed to parse session JSON from Mem0 for session {session_id}: {jde}. Content: {session_data_str[:100] if 'session_data_str' in locals() else 'N/A'}")
-            return None
+            return await self._run_cpu(self._parse_session_memory, memories[0], session_id)
+        
         except Exception as e:
             logger.error(f"Failed to load session from Mem0 for session {session_id}: {e}")
             return None
     
+    def _parse_session_memory(self, memory_entry: Any, session_id: str) -> Optional[EnhancedSession]:
+        """Decode a session from a Mem0 search hit (runs on the CPU pool)"""
+        
+        # Mem0 stores the actual data in the 'messages' field as a list of dictionaries.
+        # Assuming the first message's content holds the session JSON.
+        if not isinstance(memory_entry, dict):
+            logger.warning(f"Unexpected memory entry format: {memory_entry}. Skipping.")
+            return None
+        
+        messages_list = memory_entry.get('messages', [])
+        if not messages_list:
+            logger.warning(f"No messages found in memory entry for session {session_id}.")
+            return None
+        
+        session_data_str = _memory_content(memory_entry)
+        
+        if not session_data_str:
+            logger.warning(f"Empty session data string from memory for session {session_id}.")
+            return None
+        
+        try:
+            session_data = _load_payload(session_data_str, (memory_entry.get('metadata') or {}).get('encoding'))
+        except (ValueError, zlib.error) as e:
+            # JSONDecodeError (json and orjson) and bad base64 are both ValueErrors
+            logger.error(f"Failed to parse session data from Mem0 for session {session_id}: {e}. Content: {session_data_str[:100]}")
+            return None
+        return self._dict_to_session(session_data)
+    
     async def _store_checkpoint_to_mem0(self, checkpoint: SessionCheckpoint):
-        """Store checkpoint to Mem0"""
+        """Queue checkpoint for persistence to Mem0 alongside its session"""
+        
+        if self.memory is None:
+            logger.debug(f"No Mem0 client, skipping store for checkpoint {checkpoint.checkpoint_id}")
+            self._unconfirmed_bases.pop(checkpoint.checkpoint_id, None)
+            return
         
         try:
-            checkpoint_dict = asdict(checkpoint)
-            # Convert datetime to string for JSON serialization
-            checkpoint_dict['timestamp'] = checkpoint.timestamp.isoformat()
+            checkpoint_dict = checkpoint.to_dict(include_state=False)
             
-            checkpoint_description = (
-                f"Checkpoint {checkpoint.checkpoint_id} for session {checkpoint.session_id}: "
-                f"{checkpoint.description}. Progress: {checkpoint.progress_percentage}%"
-            )
+            # Large state is compressed off the event loop
+            state_json = _json_dumpb(checkpoint.state_data)
+            if len(state_json) >= self.STATE_COMPRESS_MIN_BYTES:
+                checkpoint_dict["state_data"] = await self._run_cpu(_encode_blob, state_json)
+                checkpoint_dict["state_encoding"] = _STATE_ENCODING
+            else:
+                checkpoint_dict["state_data"] = checkpoint.state_data
             
             metadata = {
                 "category": "checkpoint",
@@ -651,111 +1616,312 @@ class EnhancedSessionManager:
             
             # Mem0's `add` method stores the `messages` list.
             # Store the checkpoint_dict as content in a single message within the messages list.
-            checkpoint_json_content = json.dumps(checkpoint_dict)
+            checkpoint_json_content = _json_dumps(checkpoint_dict)
 
-            self.memory.add(
-                messages=[{"role": "system", "content": checkpoint_json_content}],
-                user_id="system",  # Checkpoints are system-level
-                metadata=metadata
-            )
+            self._pending_checkpoint_writes.append({
+                "messages": [{"role": "system", "content": checkpoint_json_content}],
+                "user_id": "system",  # Checkpoints are system-level
+                "metadata": metadata
+            })
+            self._schedule_flush()
             
         except Exception as e:
             logger.error(f"Failed to store checkpoint to Mem0: {e}")
+            self._unconfirmed_bases.pop(checkpoint.checkpoint_id, None)
     
-    def _session_to_dict(self, session: EnhancedSession) -> Dict[str, Any]:
-        """Convert session to dictionary for serialization"""
+    async def _load_checkpoint_state(self, checkpoint_id: str) -> Optional[Dict[str, Any]]:
+        """Load a checkpoint's state_data from its own Mem0 record"""
         
-        session_dict = asdict(session)
+        checkpoint = await self._load_checkpoint(checkpoint_id)
+        return checkpoint.state_data if checkpoint else None
+    
+    async def _load_checkpoint(self, checkpoint_id: str) -> Optional[SessionCheckpoint]:
+        """Load a checkpoint, state included, from its own Mem0 record"""
         
-        # Convert datetime objects to ISO strings
-        session_dict['created_at'] = session.created_at.isoformat()
-        session_dict['last_activity'] = session.last_activity.isoformat()
-        if session.expires_at:
-            session_dict['expires_at'] = session.expires_at.isoformat()
-        else:
-            session_dict['expires_at'] = None
+        # A queued checkpoint write is newer than anything Mem0 has
+        for write in self._pending_checkpoint_writes:
+            if write["metadata"]["checkpoint_id"] == checkpoint_id:
+                return await self._run_cpu(self._checkpoint_from_record, write["messages"][0]["content"])
+        
+        try:
+            memories = await self._cached_search(f"category:checkpoint checkpoint_id:{checkpoint_id}", 5)
+            
+            # Session records mention the id too, so match on the checkpoint's own metadata
+            for memory in memories or []:
+                metadata = memory.get('metadata') or {}
+                if metadata.get('category') == 'checkpoint' and metadata.get('checkpoint_id') == checkpoint_id:
+                    return await self._run_cpu(self._checkpoint_from_record, _memory_content(memory))
+            return None
+            
+        except Exception as e:
+            logger.error(f"Failed to load checkpoint {checkpoint_id} from Mem0: {e}")
+            return None
+    
+    def _checkpoint_from_record(self, content: str) -> SessionCheckpoint:
+        """Rebuild a checkpoint from its stored JSON, decompressing its state"""
         
-        # Convert enums to strings
-        session_dict['session_type'] = session.session_type.value
-        session_dict['state'] = session.state.value
+        checkpoint_dict = _json_loads(content)
+        checkpoint_dict['state_data'] = self._checkpoint_state(checkpoint_dict)
+        checkpoint_dict.pop('state_encoding', None)
+        checkpoint_dict['timestamp'] = datetime.fromisoformat(checkpoint_dict['timestamp'])
+        return _construct(SessionCheckpoint, _CHECKPOINT_FIELD_NAMES, checkpoint_dict)
+    
+    async def _resolve_checkpoint_state(
+        self, 
+        session: EnhancedSession, 
+        checkpoint: SessionCheckpoint
+    ) -> Optional[Dict[str, Any]]:
+        """Rebuild a checkpoint's full state by applying its delta chain"""
         
-        # Convert checkpoints
-        checkpoints = []
-        for cp in session.checkpoints:
-            cp_dict = asdict(cp)
-            cp_dict['timestamp'] = cp.timestamp.isoformat()
-            checkpoints.append(cp_dict)
-        session_dict['checkpoints'] = checkpoints
+        chain = [checkpoint]
+        while chain[-1].parent_id is not None:
+            parent = session.get_checkpoint(chain[-1].parent_id)
+            if parent is None:
+                # Rotated out of the session's recent checkpoints
+                parent = await self._load_checkpoint(chain[-1].parent_id)
+            if parent is None:
+                logger.warning(f"Parent checkpoint {chain[-1].parent_id} of session {session.session_id} is missing")
+                return None
+            chain.append(parent)
         
-        return session_dict
+        # Sessions loaded from Mem0 only carry checkpoint summaries
+        missing = [cp for cp in chain if cp.state_data is None]
+        loaded = await asyncio.gather(*[self._load_checkpoint_state(cp.checkpoint_id) for cp in missing])
+        for cp, state_data in zip(missing, loaded):
+            if state_data is None:
+                logger.warning(f"State for checkpoint {cp.checkpoint_id} of session {session.session_id} could not be loaded")
+                return None
+            cp.state_data = state_data
+        
+        state = dict(chain[-1].state_data)
+        for cp in reversed(chain[:-1]):
+            for key in cp.removed_keys:
+                state.pop(key, None)
+            state.update(cp.state_data)
+        return state
+    
+    @staticmethod
+    def _state_digest(value: Any) -> bytes:
+        """Fingerprint a context value so in-place changes show up in deltas"""
+        try:
+            raw = _json_dumpb(value)
+        except (TypeError, ValueError):
+            raw = repr(value).encode()
+        return hashlib.blake2b(raw, digest_size=16).digest()
+    
+    @staticmethod
+    def _checkpoint_state(checkpoint_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Extract state_data from a stored checkpoint, decompressing if needed"""
+        
+        encoding = checkpoint_dict.get("state_encoding")
+        if encoding is None:
+            return checkpoint_dict.get("state_data")
+        return _json_loads(_decode_blob(checkpoint_dict["state_data"], encoding))
     
     def _dict_to_session(self, session_dict: Dict[str, Any]) -> EnhancedSession:
         """Convert dictionary back to session object"""
         
-        # Convert datetime strings back to datetime objects
-        session_dict['created_at'] = datetime.fromisoformat(session_dict['created_at'])
-        session_dict['last_activity'] = datetime.fromisoformat(session_dict['last_activity'])
-        if session_dict.get('expires_at'):
-            session_dict['expires_at'] = datetime.fromisoformat(session_dict['expires_at'])
-        
-        # Convert enum strings back to enums
-        session_dict['session_type'] = SessionType(session_dict['session_type'])
-        session_dict['state'] = SessionState(session_dict['state'])
+        # Convert datetime and enum strings back in one pass over fixed field tables.
+        # A loader generated from the schema with exec() measured no faster: the
+        # time goes to fromisoformat and the dataclass constructors, not the loops.
+        fromisoformat = datetime.fromisoformat
+        for name in _SESSION_DATETIME_FIELDS:
+            value = session_dict.get(name)
+            if value:
+                session_dict[name] = fromisoformat(value)
+        for name, by_value in _SESSION_ENUM_FIELDS:
+            session_dict[name] = by_value[session_dict[name]]
         
         # Convert checkpoints
-        checkpoints = []
-        for cp_dict in session_dict.get('checkpoints', []):
-            cp_dict['timestamp'] = datetime.fromisoformat(cp_dict['timestamp'])
-            checkpoints.append(SessionCheckpoint(**cp_dict))
+        checkpoints = deque(maxlen=MAX_SESSION_CHECKPOINTS)
+        append = checkpoints.append
+        for cp_dict in session_dict.get('checkpoints', ()):
+            cp_dict['timestamp'] = fromisoformat(cp_dict['timestamp'])
+            cp_dict.setdefault('state_data', None)
+            if cp_dict.keys() == _CHECKPOINT_FIELD_NAMES:
+                append(SessionCheckpoint(**cp_dict))
+            else:
+                append(_construct(SessionCheckpoint, _CHECKPOINT_FIELD_NAMES, cp_dict))
         session_dict['checkpoints'] = checkpoints
         
-        return EnhancedSession(**session_dict)
+        if session_dict.get('latest_checkpoint_ts') is None and checkpoints:
+            # Stored before the latest timestamp was tracked; checkpoints are kept oldest first
+            session_dict['latest_checkpoint_ts'] = checkpoints[-1].timestamp
+        
+        return _construct(EnhancedSession, _SESSION_FIELD_NAMES, session_dict)
     
-    def _should_auto_checkpoint(self, session: EnhancedSession) -> bool:
+    def _should_auto_checkpoint(self, session: EnhancedSession, now: Optional[datetime] = None) -> bool:
         """Check if session should auto-checkpoint"""
         
-        if not session.checkpoints:
+        if session.latest_checkpoint_ts is None:
             return True  # First checkpoint
         
-        latest_checkpoint = max(session.checkpoints, key=lambda x: x.timestamp)
-        time_since_checkpoint = (datetime.now() - latest_checkpoint.timestamp).seconds
+        time_since_checkpoint = ((now or self._now()) - session.latest_checkpoint_ts).total_seconds()
         
         return time_since_checkpoint >= session.auto_checkpoint_interval
     
     async def _start_session_monitoring(self, session_id: str):
         """Start background monitoring for long-running sessions"""
         
-        async def monitor_session():
-            while session_id in self.active_sessions:
-                try:
-                    session = self.active_sessions[session_id]
-                    
-                    # Check if session should be auto-checkpointed
-                    if self._should_auto_checkpoint(session):
-                        await self.create_checkpoint(
-                            session_id, 
-                            f"Auto checkpoint - {datetime.now().strftime('%H:%M:%S')}"
-                        )
-                    
-                    # Check if session has expired
-                    if session.expires_at and datetime.now() > session.expires_at:
-                        session.state = SessionState.COMPLETED
-                        await self._store_session_to_mem0(session)
-                        logger.info(f"⏰ Session {session_id} expired and marked as completed")
-                        break
-                    
-                    await asyncio.sleep(60)  # Check every minute
-                    
-                except Exception as e:
-                    logger.error(f"Error monitoring session {session_id}: {e}")
-                    await asyncio.sleep(60)
+        # Keep the session cached while it is being monitored
+        self._pinned_sessions.add(session_id)
+        
+        # Expiry and auto checkpoints are checked against the monotonic clock from here on
+        session = self.active_sessions.get(session_id)
+        if session:
+            self._refresh_monitor_deadlines(session)
         
-        # Start monitoring task
-        task = asyncio.create_task(monitor_session())
-        self._background_tasks.add(task)
-        task.add_done_callback(self._background_tasks.discard)
+        # First check runs right away
+        self._schedule_monitor_check(session_id, time.monotonic())
         
         logger.info(f"🔍 Started monitoring for long-running session {session_id}")
+    
+    def _refresh_monitor_deadlines(self, session: EnhancedSession) -> float:
+        """Recompute a session's monotonic expiry and auto checkpoint deadlines; returns the earliest"""
+        
+        session_id = session.session_id
+        now, mono = self._now(), time.monotonic()
+        if session.expires_at:
+            self._expiry_deadlines[session_id] = mono + (session.expires_at - now).total_seconds()
+        else:
+            self._expiry_deadlines.pop(session_id, None)
+        if session.latest_checkpoint_ts is None:
+            self._auto_checkpoint_deadlines[session_id] = mono  # First checkpoint
+        else:
+            since = (now - session.latest_checkpoint_ts).total_seconds()
+            self._auto_checkpoint_deadlines[session_id] = mono + session.auto_checkpoint_interval - since
+        return self._next_monitor_deadline(session_id)
+    
+    def _next_monitor_deadline(self, session_id: str) -> float:
+        """Earliest of a monitored session's expiry and auto checkpoint deadlines"""
+        return min(
+            self._auto_checkpoint_deadlines.get(session_id, math.inf),
+            self._expiry_deadlines.get(session_id, math.inf)
+        )
+    
+    def _reset_auto_checkpoint_deadline(self, session: EnhancedSession):
+        """Push a monitored session's next auto checkpoint a full interval out"""
+        session_id = session.session_id
+        if session_id in self._auto_checkpoint_deadlines:
+            self._auto_checkpoint_deadlines[session_id] = time.monotonic() + session.auto_checkpoint_interval
+            if session_id in self._monitored:
+                self._schedule_monitor_check(session_id, self._next_monitor_deadline(session_id))
+    
+    def _schedule_monitor_check(self, session_id: str, deadline: float):
+        """Queue the next monitor check for a session, waking the monitor if it is now first"""
+        self._monitored[session_id] = deadline
+        heapq.heappush(self._monitor_heap, (deadline, session_id))
+        if not self._ensure_monitor_task() and self._monitor_heap[0] == (deadline, session_id):
+            self._monitor_wakeup.set()
+    
+    def _ensure_monitor_task(self) -> bool:
+        """Start the monitor on the running loop unless it already runs there; True if started.
+        
+        Callers may each run in their own event loop (app.py uses asyncio.run per
+        request), and an asyncio.Event is bound to the loop that first waits on it,
+        so the wakeup event is created together with the task.
+        """
+        loop = asyncio.get_running_loop()
+        task = self._monitor_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return False
+        self._monitor_wakeup = asyncio.Event()
+        self._monitor_task = loop.create_task(self._global_monitor())
+        return True
+    
+    def _stop_monitoring(self, session_id: str):
+        """Forget a monitored session; its heap entry is skipped when popped"""
+        
+        self._monitored.pop(session_id, None)
+        self._expiry_deadlines.pop(session_id, None)
+        self._auto_checkpoint_deadlines.pop(session_id, None)
+        self._monitor_backoff.pop(session_id, None)
+        # Let the cache evict the session once nothing is watching it
+        self._pinned_sessions.discard(session_id)
+        # Wake the monitor so it can exit once nothing is left to watch
+        if self._monitor_wakeup is not None:
+            self._monitor_wakeup.set()
+    
+    async def _global_monitor(self):
+        """Run due checks for every monitored session from a single task"""
+        
+        # A monitor left on another loop stops once _ensure_monitor_task replaces it
+        while self._monitored and self._monitor_task is asyncio.current_task():
+            # Sleep until the earliest due check, or until an earlier one is scheduled
+            timeout = self._monitor_heap[0][0] - time.monotonic() if self._monitor_heap else None
+            if timeout is None or timeout > 0:
+                self._monitor_wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._monitor_wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            now = time.monotonic()
+            due = []
+            while self._monitor_heap and self._monitor_heap[0][0] <= now:
+                deadline, session_id = heapq.heappop(self._monitor_heap)
+                # Stale entries left behind by rescheduling or stopping
+                if self._monitored.get(session_id) == deadline:
+                    due.append(session_id)
+            
+            if not due:
+                continue
+            
+            results = await asyncio.gather(
+                *(self._monitor_session_check(session_id) for session_id in due)
+            )
+            
+            # Idle sessions are not looked at again until something is due;
+            # failed ones wait out their backoff even if a deadline has passed
+            now = time.monotonic()
+            for session_id, keep in zip(due, results):
+                if keep:
+                    next_check = self._next_monitor_deadline(session_id)
+                    backoff = self._monitor_backoff.get(session_id)
+                    if backoff is not None:
+                        next_check = max(next_check, now + backoff)
+                    self._schedule_monitor_check(session_id, next_check)
+                else:
+                    self._stop_monitoring(session_id)
+    
+    async def _monitor_session_check(self, session_id: str) -> bool:
+        """Checkpoint or expire one monitored session; False stops monitoring"""
+        
+        session = self.active_sessions.get(session_id)
+        if session is None or session_id not in self._monitored:
+            return False
+        
+        try:
+            # Check if session should be auto-checkpointed; wall-clock time is
+            # only read when a checkpoint is actually created
+            if time.monotonic() >= self._auto_checkpoint_deadlines.get(session_id, 0.0):
+                await self.create_checkpoint(
+                    session_id, 
+                    f"Auto checkpoint - {self._now().strftime('%H:%M:%S')}"
+                )
+            
+            # Check if session has expired
+            deadline = self._expiry_deadlines.get(session_id)
+            if deadline is not None and time.monotonic() > deadline:
+                session.state = SessionState.COMPLETED
+                await self._store_session_to_mem0(session)
+                logger.info(f"⏰ Session {session_id} expired and marked as completed")
+                return False
+            
+        except Exception as e:
+            backoff = self._monitor_backoff.get(session_id)
+            backoff = self.ERROR_BACKOFF_MIN if backoff is None else self._next_backoff(backoff)
+            self._monitor_backoff[session_id] = backoff
+            logger.error(f"Error monitoring session {session_id}: {e}; retrying in {backoff}s")
+            return True
+        
+        self._monitor_backoff.pop(session_id, None)
+        return True
+    
+    def _next_backoff(self, backoff: float) -> float:
+        """Double a retry delay, capped at ERROR_BACKOFF_MAX"""
+        return min(backoff * 2, self.ERROR_BACKOFF_MAX)
 
     async def create_intelligent_checkpoint(self, session_id: str, description: str, state_data: Optional[Dict[str, Any]] = None) -> Optional[SessionCheckpoint]:
         """Stub for create_intelligent_checkpoint method"""
@@ -772,7 +1938,9 @@ class EnhancedSessionManager:
                 progress_percentage=getattr(session, 'progress', 0.0), # Use actual session progress
                 description=description
             )
-            session.checkpoints.append(mock_checkpoint)
+            session.add_checkpoint(mock_checkpoint)
+            self._reset_auto_checkpoint_deadline(session)
+            await self._store_checkpoint_to_mem0(mock_checkpoint)
             await self._store_session_to_mem0(session) # Persist the updated session with checkpoint
             logger.info(f"Stub: Successfully created mock checkpoint {checkpoint_id} for session {session_id}")
             return mock_checkpoint
@@ -4,36 +4,93 @@ Provides 7 specialized AI agent variants with persistent memory and context swit
 """
 
 import asyncio
+import concurrent.futures
+import functools
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import re
+import time
+from collections import Counter, deque
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime
 try:
     import google.generativeai as genai
 except ImportError:
     genai = None
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 import openai
 from mem0 import Memory
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
-class MamaBearVariant:
-    """Individual Mama Bear AI variant with specialized personality and capabilities"""
+def _format_context(context: Dict[str, Any]) -> str:
+    """Pretty-print request context for the prompt, using orjson when it is installed.
     
-    def __init__(self, variant_type: str, config: Dict[str, Any]):
-        self.variant_type = variant_type
-        self.personality = config.get('personality', '')
-        self.expertise = config.get('expertise', [])
-        self.system_prompt = self._build_system_prompt()
-        self.context_memory = []
-        
-    def _build_system_prompt(self) -> str:
-        """Build specialized system prompt for this variant"""
-        base_prompt = f"""You are Mama Bear {self.variant_type.title()}, a specialized AI assistant in the Podplay Sanctuary - a neurodivergent-friendly development platform.
+    Values json can't encode natively are written with str().
+    """
+    if orjson is not None:
+        return orjson.dumps(context, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(context, indent=2, default=str)
+
+# Model-selection keywords, matched anywhere in the message like substrings
+_CODE_KEYWORDS = re.compile(r'code|debug|implement|function', re.IGNORECASE)
+_CREATIVE_KEYWORDS = re.compile(r'creative|design|idea|brainstorm', re.IGNORECASE)
+
+# Personality and expertise of the 7 Mama Bear variants
+_VARIANT_CONFIGS = {
+    'architect': {
+        'personality': 'Systematic, methodical, focuses on structure and scalability',
+        'expertise': ['Backend design', 'Service architecture', 'System integration', 'Database design']
+    },
+    'designer': {
+        'personality': 'Creative, aesthetic-focused, emphasizes user experience',
+        'expertise': ['UI/UX design', 'Theme systems', 'Visual accessibility', 'Component libraries']
+    },
+    'guide': {
+        'personality': 'Patient, educational, breaks down complex concepts',
+        'expertise': ['Documentation', 'User guidance', 'Feature explanation', 'Learning paths']
+    },
+    'connector': {
+        'personality': 'Integration-focused, handles communication between systems',
+        'expertise': ['APIs', 'WebSockets', 'Real-time systems', 'Service integration']
+    },
+    'multimedia': {
+        'personality': 'Handles rich media, audio/video processing',
+        'expertise': ['File handling', 'Media processing', 'Multi-modal interfaces', 'Streaming']
+    },
+    'scout': {
+        'personality': 'Research-oriented, explores new technologies',
+        'expertise': ['Technology research', 'Integration testing', 'Innovation', 'Trend analysis']
+    },
+    'guardian': {
+        'personality': 'Security and reliability focused, ensures safe operations',
+        'expertise': ['Security', 'Error handling', 'Production readiness', 'Performance optimization']
+    }
+}
+
+# Variant-specific guidance appended to each system prompt
+_VARIANT_FOCUS = {
+    'architect': "Focus on system design, scalability, and technical architecture. Help structure complex projects into manageable components.",
+    'designer': "Emphasize visual design, user experience, and accessibility. Create beautiful, intuitive interfaces with sensory-friendly themes.",
+    'guide': "Provide patient, step-by-step guidance. Excel at breaking down complex topics and teaching new concepts.",
+    'connector': "Specialize in integrations, APIs, and real-time systems. Bridge different technologies seamlessly.",
+    'multimedia': "Handle rich media, file processing, and multi-modal interactions. Make complex media tasks simple.",
+    'scout': "Research new technologies, explore possibilities, and provide innovative solutions. Always curious and forward-thinking.",
+    'guardian': "Focus on security, reliability, and production readiness. Ensure safe, robust implementations."
+}
+
+@functools.lru_cache(maxsize=None)
+def _build_system_prompt(variant_type: str, personality: str, expertise: tuple) -> str:
+    """Build the specialized system prompt for a variant (cached, every agent shares them)"""
+    base_prompt = f"""You are Mama Bear {variant_type.title()}, a specialized AI assistant in the Podplay Sanctuary - a neurodivergent-friendly development platform.
 
-Your personality: {self.personality}
-Your expertise: {', '.join(self.expertise)}
+Your personality: {personality}
+Your expertise: {', '.join(expertise)}
 
 Core principles:
 - Be patient, understanding, and supportive
@@ -44,36 +101,51 @@ Core principles:
 - Always prioritize user wellbeing and cognitive comfort
 
 You are part of a sanctuary environment designed to eliminate context switching and provide seamless development support."""
+    
+    return base_prompt + "\n\n" + _VARIANT_FOCUS.get(variant_type, '')
 
-        variant_specific = {
-            'architect': "Focus on system design, scalability, and technical architecture. Help structure complex projects into manageable components.",
-            'designer': "Emphasize visual design, user experience, and accessibility. Create beautiful, intuitive interfaces with sensory-friendly themes.",
-            'guide': "Provide patient, step-by-step guidance. Excel at breaking down complex topics and teaching new concepts.",
-            'connector': "Specialize in integrations, APIs, and real-time systems. Bridge different technologies seamlessly.",
-            'multimedia': "Handle rich media, file processing, and multi-modal interactions. Make complex media tasks simple.",
-            'scout': "Research new technologies, explore possibilities, and provide innovative solutions. Always curious and forward-thinking.",
-            'guardian': "Focus on security, reliability, and production readiness. Ensure safe, robust implementations."
-        }
-        
-        return base_prompt + "\n\n" + variant_specific.get(self.variant_type, '')
+class MamaBearVariant:
+    """Individual Mama Bear AI variant with specialized personality and capabilities"""
+    
+    # Most recent context entries a variant keeps in process
+    CONTEXT_MEMORY_SIZE = 100
+    
+    def __init__(self, variant_type: str, config: Dict[str, Any]):
+        self.variant_type = variant_type
+        self.personality = config.get('personality', '')
+        # Copied so no agent can change the shared _VARIANT_CONFIGS lists
+        self.expertise = list(config.get('expertise', []))
+        self.system_prompt = _build_system_prompt(variant_type, self.personality, tuple(self.expertise))
+        # Static start of every chat prompt, see EnhancedMamaBearAgent._build_enhanced_prompt
+        self.prompt_prefix = self.system_prompt + "\n\n--- Recent Conversation History ---"
+        self.context_memory = deque(maxlen=self.CONTEXT_MEMORY_SIZE)
 
 class EnhancedMamaBearAgent:
     """Enhanced Mama Bear Agent with 7 specialized variants and persistent memory"""
     
+    # Threads for blocking Mem0 calls; also caps concurrent Mem0 requests
+    MEM0_IO_WORKERS = 8
+    
+    # A user's conversation history search is reused for this long (seconds)
+    HISTORY_CACHE_TTL = 5
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.memory = Memory()
         self.active_variant = 'architect'  # Default variant
         
-        # Initialize AI clients
-        self.anthropic = Anthropic(api_key=config.get('anthropic_api_key'))
-        self.openai_client = openai.OpenAI(api_key=config.get('openai_api_key'))
+        # Initialize AI clients; async so concurrent chats don't block the event loop
+        self.anthropic = AsyncAnthropic(api_key=config.get('anthropic_api_key'))
+        self.openai_client = openai.AsyncOpenAI(api_key=config.get('openai_api_key'))
         
         # Configure Google AI if available
         google_api_key = config.get('google_api_key')
         if google_api_key and genai and hasattr(genai, 'configure'):
             genai.configure(api_key=google_api_key)
         
+        # Gemini model clients by model name, built on first use
+        self._gemini_models: Dict[str, Any] = {}
+        
         # Initialize variants
         self.variants = self._initialize_variants()
         
@@ -81,44 +153,26 @@ class EnhancedMamaBearAgent:
         self.conversation_id = None
         self.user_preferences = {}
         
+        # Mem0's client is synchronous, so its calls run here instead of on the event loop
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.MEM0_IO_WORKERS,
+            thread_name_prefix="mama-bear-mem0"
+        )
+        
+        # user_id -> (monotonic time, history), plus the search in flight per user
+        self._history_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._history_inflight: Dict[str, asyncio.Task] = {}
+        
+        # (user_id, variant) pairs that have chatted since their context was last saved
+        self._variant_dirty: Set[Tuple[str, str]] = set()
+        
         logger.info("Enhanced Mama Bear Agent initialized with 7 variants")
     
     def _initialize_variants(self) -> Dict[str, MamaBearVariant]:
         """Initialize all 7 Mama Bear variants"""
-        variant_configs = {
-            'architect': {
-                'personality': 'Systematic, methodical, focuses on structure and scalability',
-                'expertise': ['Backend design', 'Service architecture', 'System integration', 'Database design']
-            },
-            'designer': {
-                'personality': 'Creative, aesthetic-focused, emphasizes user experience',
-                'expertise': ['UI/UX design', 'Theme systems', 'Visual accessibility', 'Component libraries']
-            },
-            'guide': {
-                'personality': 'Patient, educational, breaks down complex concepts',
-                'expertise': ['Documentation', 'User guidance', 'Feature explanation', 'Learning paths']
-            },
-            'connector': {
-                'personality': 'Integration-focused, handles communication between systems',
-                'expertise': ['APIs', 'WebSockets', 'Real-time systems', 'Service integration']
-            },
-            'multimedia': {
-                'personality': 'Handles rich media, audio/video processing',
-                'expertise': ['File handling', 'Media processing', 'Multi-modal interfaces', 'Streaming']
-            },
-            'scout': {
-                'personality': 'Research-oriented, explores new technologies',
-                'expertise': ['Technology research', 'Integration testing', 'Innovation', 'Trend analysis']
-            },
-            'guardian': {
-                'personality': 'Security and reliability focused, ensures safe operations',
-                'expertise': ['Security', 'Error handling', 'Production readiness', 'Performance optimization']
-            }
-        }
-        
         return {
             variant_type: MamaBearVariant(variant_type, config)
-            for variant_type, config in variant_configs.items()
+            for variant_type, config in _VARIANT_CONFIGS.items()
         }
     
     async def switch_variant(self, variant_type: str, user_id: str) -> Dict[str, Any]:
@@ -126,8 +180,9 @@ class EnhancedMamaBearAgent:
         if variant_type not in self.variants:
             raise ValueError(f"Unknown variant: {variant_type}")
         
-        # Save current context to memory
-        if self.active_variant:
+        # Save current context to memory, unless nothing happened since the last save
+        if self.active_variant and (user_id, self.active_variant) in self._variant_dirty:
+            self._variant_dirty.discard((user_id, self.active_variant))
             await self._save_context_to_memory(user_id, self.active_variant)
         
         # Switch variant
@@ -169,6 +224,7 @@ class EnhancedMamaBearAgent:
             
             # Save to memory
             await self._save_interaction_to_memory(user_id, message, response)
+            self._variant_dirty.add((user_id, current_variant.variant_type))
             
             return {
                 'response': response,
@@ -189,20 +245,16 @@ class EnhancedMamaBearAgent:
     async def _build_enhanced_prompt(self, message: str, variant: MamaBearVariant, 
                                    history: List[Dict], context: Optional[Dict]) -> str:
         """Build enhanced prompt with context and memory"""
-        prompt_parts = [
-            variant.system_prompt,
-            "\n--- Recent Conversation History ---"
-        ]
+        prompt_parts = [variant.prompt_prefix]
         
         # Add recent conversation history
         for interaction in history[-5:]:  # Last 5 interactions
-            prompt_parts.append(f"User: {interaction.get('user_message', '')}")
-            prompt_parts.append(f"Assistant: {interaction.get('assistant_response', '')}")
+            prompt_parts.append(f"User: {interaction.get('user_message', '')}\nAssistant: {interaction.get('assistant_response', '')}")
         
         # Add current context if provided
         if context:
             prompt_parts.append(f"\n--- Current Context ---")
-            prompt_parts.append(json.dumps(context, indent=2))
+            prompt_parts.append(_format_context(context))
         
         # Add current user message
         prompt_parts.extend([
@@ -215,10 +267,10 @@ class EnhancedMamaBearAgent:
     
     async def _select_optimal_model(self, message: str, expertise: List[str]) -> str:
         """Select the best AI model based on the task and variant expertise"""
-        # Simple heuristics for model selection
-        if any(keyword in message.lower() for keyword in ['code', 'debug', 'implement', 'function']):
+        # Simple heuristics for model selection; each keyword group is one regex scan
+        if _CODE_KEYWORDS.search(message):
             return 'claude-3-5-sonnet-20241022'  # Best for coding
-        elif any(keyword in message.lower() for keyword in ['creative', 'design', 'idea', 'brainstorm']):
+        elif _CREATIVE_KEYWORDS.search(message):
             return 'gemini-1.5-pro'  # Good for creative tasks
         elif 'Backend design' in expertise or 'System integration' in expertise:
             return 'claude-3-5-sonnet-20241022'  # Architecture tasks
@@ -229,7 +281,7 @@ class EnhancedMamaBearAgent:
         """Generate response using the selected model"""
         try:
             if model.startswith('claude'):
-                response = self.anthropic.messages.create(
+                response = await self.anthropic.messages.create(
                     model=model,
                     max_tokens=2000,
                     messages=[{"role": "user", "content": prompt}]
@@ -246,7 +298,7 @@ class EnhancedMamaBearAgent:
                 return "I apologize, but I couldn't generate a response."
             
             elif model.startswith('gpt'):
-                response = self.openai_client.chat.completions.create(
+                response = await self.openai_client.chat.completions.create(
                     model=model,
                     messages=[{"role": "user", "content": prompt}],
                     max_tokens=2000
@@ -256,8 +308,10 @@ class EnhancedMamaBearAgent:
             
             elif model.startswith('gemini') and genai:
                 if hasattr(genai, 'GenerativeModel'):
-                    model_instance = genai.GenerativeModel(model)
-                    response = model_instance.generate_content(prompt)
+                    model_instance = self._gemini_models.get(model)
+                    if model_instance is None:
+                        model_instance = self._gemini_models[model] = genai.GenerativeModel(model)
+                    response = await model_instance.generate_content_async(prompt)
                     try:
                         return response.text
                     except ValueError:
@@ -275,7 +329,7 @@ class EnhancedMamaBearAgent:
             
             else:
                 # Fallback to Claude
-                response = self.anthropic.messages.create(
+                response = await self.anthropic.messages.create(
                     model='claude-3-5-haiku-20241022',
                     max_tokens=2000,
                     messages=[{"role": "user", "content": prompt}]
@@ -295,10 +349,36 @@ class EnhancedMamaBearAgent:
             logger.error(f"Error generating response with {model}: {str(e)}")
             return "I'm having trouble generating a response right now. Could you try rephrasing your question?"
     
+    async def _run_io(self, func, *args, **kwargs):
+        """Run a blocking Mem0 call on the I/O thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, functools.partial(func, *args, **kwargs))
+    
     async def _get_conversation_history(self, user_id: str) -> List[Dict]:
-        """Retrieve conversation history from memory"""
+        """Retrieve conversation history, sharing recent and in-flight searches per user"""
+        
+        cached = self._history_cache.get(user_id)
+        if cached is not None and time.monotonic() - cached[0] < self.HISTORY_CACHE_TTL:
+            return cached[1]
+        
+        task = self._history_inflight.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self._search_conversation_history(user_id))
+            self._history_inflight[user_id] = task
+            task.add_done_callback(lambda done: self._forget_history_search(user_id, done))
+        # One caller being cancelled must not cancel the search for the others
+        return await asyncio.shield(task)
+    
+    def _forget_history_search(self, user_id: str, task: asyncio.Task):
+        """Drop a finished search unless a newer one has replaced it"""
+        if self._history_inflight.get(user_id) is task:
+            del self._history_inflight[user_id]
+    
+    async def _search_conversation_history(self, user_id: str) -> List[Dict]:
+        """Search Mem0 for a user's conversation history and cache the result"""
         try:
-            memories = self.memory.search(f"user:{user_id} conversation", limit=10)
+            started = time.monotonic()
+            memories = await self._run_io(self.memory.search, f"user:{user_id} conversation", limit=10)
             # Handle both dict and string memory types
             if isinstance(memories, list):
                 result = []
@@ -308,8 +388,13 @@ class EnhancedMamaBearAgent:
                     else:
                         # If memory is a string or other type, skip it
                         continue
-                return result
-            return []
+            else:
+                result = []
+            
+            # A save while this search ran invalidated it; don't cache a stale result
+            if self._history_inflight.get(user_id) is asyncio.current_task():
+                self._history_cache[user_id] = (started, result)
+            return result
         except Exception as e:
             logger.error(f"Error retrieving conversation history: {str(e)}")
             return []
@@ -317,14 +402,8 @@ class EnhancedMamaBearAgent:
     async def _save_interaction_to_memory(self, user_id: str, user_message: str, assistant_response: str):
         """Save interaction to persistent memory"""
         try:
-            interaction_data = {
-                'user_message': user_message,
-                'assistant_response': assistant_response,
-                'variant': self.active_variant,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            self.memory.add(
+            await self._run_io(
+                self.memory.add,
                 messages=[
                     {"role": "user", "content": user_message},
                     {"role": "assistant", "content": assistant_response}
@@ -337,6 +416,10 @@ class EnhancedMamaBearAgent:
                 }
             )
             
+            # The next history lookup must see this interaction
+            self._history_cache.pop(user_id, None)
+            self._history_inflight.pop(user_id, None)
+            
         except Exception as e:
             logger.error(f"Error saving interaction to memory: {str(e)}")
     
@@ -349,7 +432,8 @@ class EnhancedMamaBearAgent:
                 'conversation_state': 'paused'
             }
             
-            self.memory.add(
+            await self._run_io(
+                self.memory.add,
                 messages=[{"role": "system", "content": f"Context saved for variant {variant}"}],
                 user_id=user_id,
                 metadata=context_data
@@ -361,7 +445,8 @@ class EnhancedMamaBearAgent:
     async def _load_context_from_memory(self, user_id: str, variant: str) -> List[Dict]:
         """Load context for a specific variant"""
         try:
-            memories = self.memory.search(
+            memories = await self._run_io(
+                self.memory.search,
                 f"user:{user_id} variant:{variant}",
                 limit=5
             )
@@ -409,28 +494,24 @@ class EnhancedMamaBearAgent:
     async def get_user_insights(self, user_id: str) -> Dict[str, Any]:
         """Get insights about user preferences and interaction patterns"""
         try:
-            memories = self.memory.search(f"user:{user_id}", limit=50)
+            memories = await self._run_io(self.memory.search, f"user:{user_id}", limit=50)
             
             # Analyze interaction patterns
-            variant_usage = {}
-            total_interactions = len(memories) if isinstance(memories, list) else 0
+            if not isinstance(memories, list):
+                memories = []
+            total_interactions = len(memories)
             
-            if isinstance(memories, list):
-                for memory in memories:
-                    if isinstance(memory, dict):
-                        metadata = memory.get('metadata', {})
-                        if isinstance(metadata, dict):
-                            variant = metadata.get('variant', 'unknown')
-                            variant_usage[variant] = variant_usage.get(variant, 0) + 1
+            metadatas = (memory.get('metadata', {}) for memory in memories if isinstance(memory, dict))
+            variant_usage = Counter(
+                metadata.get('variant', 'unknown') for metadata in metadatas if isinstance(metadata, dict)
+            )
             
-            most_used = None
-            if variant_usage:
-                # Find the variant with the highest usage count
-                most_used = max(variant_usage.keys(), key=lambda k: variant_usage[k])
+            # Ties go to the variant seen first, as before
+            most_used = variant_usage.most_common(1)[0][0] if variant_usage else None
             
             return {
                 'total_interactions': total_interactions,
-                'variant_preferences': variant_usage,
+                'variant_preferences': dict(variant_usage),
                 'most_used_variant': most_used,
                 'interaction_history_available': total_interactions > 0
             }
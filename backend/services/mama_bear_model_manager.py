@@ -83,6 +83,9 @@ class MamaBearModelManager:
         self.health_check_interval = 300  # 5 minutes
         self._monitoring_task = None
         
+        # Bumped whenever a model's quota or health changes, see get_model_status_version()
+        self._status_version = 0
+        
         # Background health monitoring will be started separately to avoid event loop issues
     
     def _initialize_models(self) -> Dict[str, ModelConfig]:
@@ -189,6 +192,7 @@ class MamaBearModelManager:
         model_config.current_requests_minute += 1
         model_config.current_requests_day += 1
         model_config.last_request_time = current_time
+        self._status_version += 1
     
     def _get_quota_status(self, model_config: ModelConfig) -> QuotaStatus:
         """Check current quota status for a model"""
@@ -312,6 +316,7 @@ class MamaBearModelManager:
                 self.logger.warning(f"Quota exceeded for {model_config.name if model_config else 'unknown model'}: {e}") # Add null check for model_config
                 if model_config: # Add null check for model_config
                     model_config.current_requests_day = model_config.requests_per_day  # Mark as exhausted
+                    self._status_version += 1
                 raise QuotaExceededException(f"Quota exceeded: {e}")
             
             # Handle other API errors
@@ -320,6 +325,7 @@ class MamaBearModelManager:
                 if model_config.consecutive_errors >= 3:
                     model_config.is_healthy = False
                     model_config.last_error = str(e)
+                self._status_version += 1
             
             raise APIException(f"API call failed: {e}")
     
@@ -368,6 +374,7 @@ class MamaBearModelManager:
                 # Success! Reset error counters
                 selected_model.consecutive_errors = 0
                 selected_model.is_healthy = True
+                self._status_version += 1
                 
                 # Create response object
                 processing_time = time.time() - start_time
@@ -418,6 +425,7 @@ class MamaBearModelManager:
                         config.consecutive_errors = 0
                         config.is_healthy = True
                         config.last_error = None
+                        self._status_version += 1
                         self.logger.info(f"Restored health status for {config.name}")
                 
                 # Adjust global fallback delay based on recent performance
@@ -445,6 +453,10 @@ class MamaBearModelManager:
             self._monitoring_task = None
             self.logger.info("🐻 Stopped background health monitoring")
     
+    def get_model_status_version(self) -> int:
+        """Counter that changes whenever get_model_status() would report something new"""
+        return self._status_version
+    
     def get_model_status(self) -> Dict[str, Any]:
         """Get current status of all models for monitoring"""
         status = {}
@@ -534,6 +546,7 @@ class MamaBearModelManager:
             except Exception as e:
                 self.logger.warning(f"✗ {config.name} failed warm-up: {e}")
                 config.is_healthy = False
+                self._status_version += 1
 
 # Custom exceptions
 class QuotaExceededException(Exception):
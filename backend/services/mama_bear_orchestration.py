@@ -6,8 +6,10 @@ Core logic for agent collaboration, context awareness, and workflow management
 
 import asyncio
 import json
+import re
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from enum import Enum
 from dataclasses import dataclass, asdict
 from abc import ABC, abstractmethod
@@ -25,6 +27,20 @@ from .mama_bear_workflow_logic import (
 
 logger = logging.getLogger(__name__)
 
+# Daily request limit assumed for each model when estimating remaining API quota
+_DEFAULT_DAILY_LIMIT = 1500
+
+# Keyword routes for _analyze_request's fast path. A request matching exactly one
+# route goes straight to its agent; short requests matching none go to the page's
+# default agent. Everything else is classified by the model.
+_FAST_PATH_ROUTES = (
+    (re.compile(r'\b(?:deploy\w*|docker|k8s|kubernetes|ci/cd|production)\b'), 'devops_specialist'),
+    (re.compile(r'\b(?:code|function|debug\w*|bug|implement\w*|refactor\w*)\b'), 'lead_developer'),
+    (re.compile(r'\b(?:research\w*|find|search|explain|what is)\b'), 'research_specialist'),
+    (re.compile(r'\b(?:api|apis|integrat\w*|webhooks?)\b'), 'integration_architect'),
+)
+_FAST_PATH_MAX_WORDS = 12
+
 class AgentState(Enum):
     IDLE = "idle"
     THINKING = "thinking"
@@ -130,12 +146,18 @@ class AgentCapability(ABC):
 class ContextAwareness:
     """Manages what agents know about the current situation"""
     
+    # Resource limits are reused for this long (seconds) while the model status is unchanged
+    RESOURCE_LIMITS_TTL = 0.5
+    
     def __init__(self, memory_manager, model_manager):
         self.memory = memory_manager
         self.model_manager = model_manager
         self.global_context = {}
         self.agent_contexts = {}
         
+        # agent_id -> (monotonic time, model status version, limits)
+        self._limits_cache: Dict[str, Tuple[float, Any, Dict[str, Any]]] = {}
+        
     async def update_global_context(self, key: str, value: Any):
         """Update global context that all agents can access"""
         self.global_context[key] = {
@@ -186,44 +208,37 @@ class ContextAwareness:
         return tool_mapping.get(agent_type, [])
     
     async def _get_resource_limits(self, agent_id: str) -> Dict[str, Any]:
-        """Get resource limits for this agent"""
+        """Get resource limits for this agent (a shared dict, not to be modified)"""
+        # Model managers without a status version fall back to the TTL alone
+        get_version = getattr(self.model_manager, 'get_model_status_version', None)
+        version = get_version() if get_version is not None else None
+        
+        now = time.monotonic()
+        cached = self._limits_cache.get(agent_id)
+        if cached is not None and cached[1] == version and now - cached[0] < self.RESOURCE_LIMITS_TTL:
+            return cached[2]
+        
+        limits = self._compute_resource_limits()
+        self._limits_cache[agent_id] = (now, version, limits)
+        return limits
+    
+    def _compute_resource_limits(self) -> Dict[str, Any]:
+        """Build resource limits from the model manager's current quota status"""
         try:
             # Check current quota status from model manager
             model_status = self.model_manager.get_model_status()
             
-            # Calculate remaining quota from all available models
-            healthy_models = 0
-            total_models = 0
-            api_quota_remaining = 0
-            
-            if model_status and isinstance(model_status, dict):
-                for model_id, model_info in model_status.items():
-                    if model_info and isinstance(model_info, dict):
-                        total_models += 1
-                        
-                        # Check if model is healthy
-                        is_healthy = model_info.get('is_healthy', False)
-                        if is_healthy:
-                            healthy_models += 1
-                        
-                        # Calculate remaining quota safely
-                        requests_today = model_info.get('requests_today', 0)
-                        if requests_today is None:
-                            requests_today = 0
-                        
-                        # Safely get daily limit and ensure it's valid
-                        daily_limit = 1500  # Default daily limit
-                        try:
-                            remaining = max(0, daily_limit - int(requests_today))
-                            api_quota_remaining += remaining
-                        except (TypeError, ValueError):
-                            # If there's any issue with conversion, use safe default
-                            api_quota_remaining += daily_limit
-            
-            # Ensure we have valid numbers for comparisons
-            healthy_models = max(0, healthy_models) if healthy_models is not None else 0
-            total_models = max(1, total_models) if total_models is not None else 1  # Avoid division by zero
-            api_quota_remaining = max(0, api_quota_remaining) if api_quota_remaining is not None else 0
+            # Calculate remaining quota from all available models in one pass each
+            models = [
+                model_info for model_info in model_status.values()
+                if model_info and isinstance(model_info, dict)
+            ] if isinstance(model_status, dict) else []
+            healthy_models = sum(1 for model_info in models if model_info.get('is_healthy'))
+            total_models = len(models) or 1  # Avoid division by zero
+            api_quota_remaining = sum(
+                max(0, _DEFAULT_DAILY_LIMIT - int(model_info.get('requests_today') or 0))
+                for model_info in models
+            )
             
             return {
                 'api_quota_remaining': api_quota_remaining,
@@ -233,7 +248,7 @@ class ContextAwareness:
                 'model_health': {
                     'healthy_models': healthy_models,
                     'total_models': total_models,
-                    'health_ratio': healthy_models / total_models if total_models > 0 else 0
+                    'health_ratio': healthy_models / total_models
                 }
             }
             
@@ -432,6 +447,11 @@ class AgentOrchestrator:
     async def _analyze_request(self, message: str, page_context: str) -> Dict[str, Any]:
         """Analyze user request to determine optimal agent strategy"""
         
+        # Clear-cut requests are routed by keyword without a model round trip
+        strategy = self._fast_path_strategy(message, page_context)
+        if strategy is not None:
+            return strategy
+        
         # Use the research specialist to analyze the request
         analysis_prompt = f"""
         Analyze this user request and determine the optimal agent strategy:
@@ -471,10 +491,20 @@ class AgentOrchestrator:
         else:
             return self._fallback_strategy(page_context)
     
+    def _fast_path_strategy(self, message: str, page_context: str) -> Optional[Dict[str, Any]]:
+        """Route a request by keywords, or return None if it needs model analysis"""
+        text = message.lower()
+        agents = [agent for pattern, agent in _FAST_PATH_ROUTES if pattern.search(text)]
+        
+        if len(agents) == 1:
+            return {'type': 'simple_response', 'primary_agent': agents[0]}
+        if not agents and len(text.split()) <= _FAST_PATH_MAX_WORDS:
+            return self._fallback_strategy(page_context)
+        return None
+    
     def _extract_strategy_from_response(self, response: str) -> Dict[str, Any]:
         """Extract strategy object from AI response"""
         # Try to find JSON in the response
-        import re
         json_match = re.search(r'\{.*\}', response, re.DOTALL)
         if json_match:
             try:
@@ -5,6 +5,8 @@ Enhanced with Scout.new-level session management capabilities
 """
 
 import asyncio
+import concurrent.futures
+import functools
 import json
 import logging
 import re  # Import the re module for regular expressions
@@ -25,6 +27,10 @@ except ImportError:
     
 logger = logging.getLogger(__name__) # Move logger initialization to top
 
+def _search_query(*terms: Optional[str]) -> str:
+    """Join Mem0 search terms with spaces, skipping empty ones"""
+    return " ".join([term for term in terms if term])
+
 class MemoryManager:
     """Manages persistent memory for the Podplay Sanctuary using Mem0"""
     
@@ -42,8 +48,19 @@ class MemoryManager:
             'themes': 'theme_preferences'
         }
         
+        # Mem0 calls block (HTTP, embeddings), so they run off the event loop
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=8,
+            thread_name_prefix="memory-mem0"
+        )
+        
         logger.info("Memory Manager initialized with Mem0")
     
+    async def _run_io(self, func, *args, **kwargs):
+        """Run a blocking Mem0 call on the I/O thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, functools.partial(func, *args, **kwargs))
+    
     async def store_conversation(self, user_id: str, conversation_data: Dict[str, Any]) -> str:
         """Store conversation data with metadata"""
         try:
@@ -79,7 +96,8 @@ class MemoryManager:
             if 'context' in conversation_data:
                 metadata['context'] = json.dumps(conversation_data['context'])
             
-            self.memory.add(
+            await self._run_io(
+                self.memory.add,
                 messages=messages,
                 user_id=user_id,
                 metadata=metadata
@@ -108,7 +126,8 @@ class MemoryManager:
                 "preference_type": "user_settings"
             }
             
-            self.memory.add(
+            await self._run_io(
+                self.memory.add,
                 messages=[{"role": "system", "content": pref_description}],
                 user_id=user_id,
                 metadata=metadata
@@ -141,7 +160,8 @@ class MemoryManager:
                 "phase": project_data.get('phase', 'planning')
             }
             
-            self.memory.add(
+            await self._run_io(
+                self.memory.add,
                 messages=[{"role": "system", "content": project_description}],
                 user_id=user_id,
                 metadata=metadata
@@ -172,7 +192,8 @@ class MemoryManager:
                 "active_page": sanctuary_data.get('active_page', 'main_chat')
             }
             
-            self.memory.add(
+            await self._run_io(
+                self.memory.add,
                 messages=[{"role": "system", "content": state_description}],
                 user_id=user_id,
                 metadata=metadata
@@ -189,15 +210,13 @@ class MemoryManager:
                               limit: int = 10, query: Optional[str] = None) -> List[Dict[str, Any]]:
         """Retrieve memories with optional filtering"""
         try:
-            search_query = f"user:{user_id}"
-            
-            if category and category in self.memory_categories:
-                search_query += f" category:{category}"
-            
-            if query:
-                search_query += f" {query}"
+            search_query = _search_query(
+                f"user:{user_id}",
+                f"category:{category}" if category and category in self.memory_categories else None,
+                query
+            )
             
-            memories = self.memory.search(search_query, limit=limit)
+            memories = await self._run_io(self.memory.search, search_query, limit=limit)
             
             # Process and enrich memories
             processed_memories = []
@@ -228,11 +247,12 @@ class MemoryManager:
                                      variant: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get conversation history, optionally filtered by Mama Bear variant"""
         try:
-            search_query = f"user:{user_id} category:conversation"
-            if variant:
-                search_query += f" variant:{variant}"
+            search_query = _search_query(
+                f"user:{user_id} category:conversation",
+                f"variant:{variant}" if variant else None
+            )
             
-            memories = self.memory.search(search_query, limit=limit)
+            memories = await self._run_io(self.memory.search, search_query, limit=limit)
             
             # Process conversation memories
             conversations = []
@@ -285,7 +305,7 @@ class MemoryManager:
     async def get_user_preferences(self, user_id: str) -> Dict[str, Any]:
         """Get current user preferences"""
         try:
-            memories = self.memory.search(f"user:{user_id} category:preferences", limit=5)
+            memories = await self._run_io(self.memory.search, f"user:{user_id} category:preferences", limit=5)
             
             # Merge preferences from most recent memories
             preferences = {
@@ -305,12 +325,10 @@ class MemoryManager:
                 metadata = memory.get('metadata', {})
                 
                 # Mem0 stores messages in a list of dicts. Reconstruct full content from these messages.
-                messages_list = memory.get('messages', [])
-                memory_content = ""
-                for msg_obj in messages_list:
-                    if isinstance(msg_obj, dict) and 'content' in msg_obj:
-                         memory_content += msg_obj['content'] + " "
-                memory_content = memory_content.strip()
+                memory_content = " ".join([
+                    msg_obj['content'] for msg_obj in memory.get('messages', [])
+                    if isinstance(msg_obj, dict) and 'content' in msg_obj
+                ]).strip()
 
                 # Try to extract preferences from memory content
                 try:
@@ -348,11 +366,12 @@ class MemoryManager:
     async def get_project_context(self, user_id: str, project_name: Optional[str] = None) -> Dict[str, Any]:
         """Get project context and history"""
         try:
-            search_query = f"user:{user_id} category:project"
-            if project_name:
-                search_query += f" project_name:{project_name}"
+            search_query = _search_query(
+                f"user:{user_id} category:project",
+                f"project_name:{project_name}" if project_name else None
+            )
             
-            memories = self.memory.search(search_query, limit=10)
+            memories = await self._run_io(self.memory.search, search_query, limit=10)
             
             project_context = {
                 'current_project': None,
@@ -422,11 +441,12 @@ class MemoryManager:
                             category: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
         """Search memories with semantic similarity"""
         try:
-            search_query = f"user:{user_id} {query}"
-            if category:
-                search_query += f" category:{category}"
+            search_query = _search_query(
+                f"user:{user_id} {query}",
+                f"category:{category}" if category else None
+            )
             
-            memories = self.memory.search(search_query, limit=limit)
+            memories = await self._run_io(self.memory.search, search_query, limit=limit)
             
             results = []
             for memory in memories:
@@ -464,7 +484,8 @@ class MemoryManager:
                 "update_type": "modification"
             }
             
-            self.memory.add(
+            await self._run_io(
+                self.memory.add,
                 messages=[{"role": "system", "content": update_description}],
                 user_id=user_id,
                 metadata=metadata
@@ -491,7 +512,8 @@ class MemoryManager:
                 "status": "marked_deleted"
             }
             
-            self.memory.add(
+            await self._run_io(
+                self.memory.add,
                 messages=[{"role": "system", "content": delete_description}],
                 user_id=user_id,
                 metadata=metadata
@@ -508,7 +530,7 @@ class MemoryManager:
         """Get statistics about user's memory usage"""
         try:
             # Get all memories for user
-            memories = self.memory.search(f"user:{user_id}", limit=1000)
+            memories = await self._run_io(self.memory.search, f"user:{user_id}", limit=1000)
             
             stats = {
                 'total_memories': len(memories),
@@ -7,7 +7,7 @@ and seamless integration with Mama Bear orchestration system.
 import asyncio
 import logging
 import os
-from typing import Dict, List, Optional, Any, Union, Callable
+from typing import Dict, List, Optional, Any, Union, Callable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import json
@@ -142,6 +142,7 @@ class ScrapybaraInstance:
     created_at: float
     timeout_hours: int
     tools: List[Any] = field(default_factory=list)
+    tool_names: Tuple[str, ...] = ()
     auth_states: Dict[str, str] = field(default_factory=dict)
     is_active: bool = True
     
@@ -294,7 +295,8 @@ class ScrapybaraManager:
                 instance=scrapybara_instance,
                 created_at=time.time(),
                 timeout_hours=timeout_hours,
-                tools=tools
+                tools=tools,
+                tool_names=tuple(tool.__class__.__name__ for tool in tools)
             )
             
             self.instances[instance_id] = managed_instance
@@ -128,6 +128,12 @@ class ScrapybaraIntegrationTest:
                 "description": "Create a development plan for a new project",
                 "expected_handler": "mama_bear",
                 "expected_category": "planning"
+            },
+            {
+                # Keywords match whole words: "typescript" is not "type"
+                "description": "Reinstall the typescript compiler",
+                "expected_handler": "scrapybara",
+                "expected_category": "development"
             }
         ]
         